@@ -0,0 +1,103 @@
+"""
+Memory-lean data path for training and inference
+Loads features with float32 numerics, categorical symbols and int64 epoch
+timestamps, and hands sklearn C-contiguous float32 arrays so tree
+estimators don't make their own converted copy
+"""
+from typing import List, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+TARGET_COLUMN = "target"
+SYMBOL_COLUMNS = ["symbol"]
+TIME_COLUMNS = ["datetime", "Datetime", "Date"]
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process in MB (0.0 if unavailable)"""
+    if resource is None:
+        return 0.0
+    # ru_maxrss is KB on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def memory_report(label: str, df: pd.DataFrame = None, *arrays: np.ndarray) -> dict:
+    """Log and return frame/array bytes alongside the process peak RSS"""
+    report = {
+        "label": label,
+        "frame_mb": df.memory_usage(deep=True).sum() / 1024 ** 2 if df is not None else 0.0,
+        "arrays_mb": sum(a.nbytes for a in arrays) / 1024 ** 2,
+        "peak_rss_mb": peak_rss_mb(),
+    }
+    logger.info(
+        f"[memory] {label}: frame={report['frame_mb']:.1f}MB "
+        f"arrays={report['arrays_mb']:.1f}MB peak_rss={report['peak_rss_mb']:.1f}MB"
+    )
+    return report
+
+
+def lean_dtypes(path: str) -> dict:
+    """Build a read_csv dtype map from the file header"""
+    columns = pd.read_csv(path, nrows=0).columns
+    dtypes = {}
+    for col in columns:
+        if col in SYMBOL_COLUMNS:
+            dtypes[col] = "category"
+        elif col not in TIME_COLUMNS:
+            dtypes[col] = np.float32
+    return dtypes
+
+
+def epoch_time_columns(df: pd.DataFrame) -> pd.DataFrame:
+    """Convert any time columns to int64 epoch seconds in place"""
+    for col in TIME_COLUMNS:
+        if col in df.columns:
+            df[col] = pd.to_datetime(df[col], utc=True).astype("int64") // 10 ** 9
+    return df
+
+
+def load_features_lean(path: str = "data/processed/features/features.csv") -> pd.DataFrame:
+    """Load features as float32 / category / int64 epoch seconds"""
+    df = epoch_time_columns(pd.read_csv(path, dtype=lean_dtypes(path)))
+    memory_report("features loaded (lean)", df)
+    return df
+
+
+def feature_columns(df: pd.DataFrame) -> List[str]:
+    """Model input columns: everything except target, symbol and time columns"""
+    excluded = {TARGET_COLUMN, *SYMBOL_COLUMNS, *TIME_COLUMNS}
+    return [col for col in df.columns if col not in excluded]
+
+
+def to_model_matrix(df: pd.DataFrame, columns: List[str] = None) -> np.ndarray:
+    """Return a writable C-contiguous float32 matrix of the feature columns"""
+    columns = columns or feature_columns(df)
+    # np.require only copies when the pandas buffer isn't already usable as-is
+    return np.require(df[columns].to_numpy(dtype=np.float32, copy=False), requirements=["C", "W"])
+
+
+def shuffle_split(X: np.ndarray, y: np.ndarray, test_size: float = 0.2,
+                  random_state: int = None) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Shuffle X and y in place with one permutation and split into views
+
+    Unlike train_test_split this never materialises index-gathered copies;
+    the returned train/test parts are contiguous slices of X and y.
+    """
+    seed = np.random.SeedSequence(random_state).entropy
+    np.random.default_rng(seed).shuffle(X)
+    np.random.default_rng(seed).shuffle(y)
+
+    n_test = int(np.ceil(len(X) * test_size))
+    n_train = len(X) - n_test
+    return X[:n_train], X[n_train:], y[:n_train], y[n_train:]
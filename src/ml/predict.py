@@ -5,142 +5,247 @@ Generates predictions with symbol information from historical prices
 import joblib
 import pandas as pd
 import os
+import sys
+from src.ml.lean_data import load_features_lean, to_model_matrix, memory_report
+from src.ml.prediction_cache import PredictionCache, model_version
+from src.ml.prediction_store import PredictionStore
 from src.utils.logger import get_logger
 from src.utils.config import Config
 
 logger = get_logger(__name__)
 
+# Columns added by prediction; never passed to the model
+METADATA_COLUMNS = ["symbol", "datetime", "price", "predicted_price"]
 
-def predict():
-    """Generate predictions for stock prices"""
-    try:
-        # Load model
-        if not os.path.exists("model.pkl"):
-            logger.error("Model file not found. Please train the model first.")
-            print("[ERROR] Model file (model.pkl) not found.")
-            print("[INFO] Run: python -m src.ml.train_model")
-            return
-        
-        model = joblib.load("model.pkl")
-        logger.info("Model loaded successfully")
-        
-        # Try to load features.csv
-        features_file = "data/processed/features/features.csv"
-        if not os.path.exists(features_file):
-            logger.error(f"Features file not found: {features_file}")
-            print(f"[ERROR] Features file not found: {features_file}")
-            print("[INFO] Run feature engineering first")
-            return
-        
-        df = pd.read_csv(features_file)
-        logger.info(f"Loaded {len(df)} records from features.csv")
-        
-        # Prepare features for prediction
-        X = df.drop(columns=["target"], errors="ignore")
-        
-        # Generate predictions
+
+def _load_model_and_features(lean: bool = False):
+    """Load model.pkl, its version hash and features.csv, printing guidance if either is missing"""
+    if not os.path.exists("model.pkl"):
+        logger.error("Model file not found. Please train the model first.")
+        print("[ERROR] Model file (model.pkl) not found.")
+        print("[INFO] Run: python -m src.ml.train_model")
+        return None, None, None
+
+    model = joblib.load("model.pkl")
+    # Hashed once here rather than on every _score() call
+    version = model_version("model.pkl")
+    logger.info("Model loaded successfully")
+
+    # Try to load features.csv
+    features_file = "data/processed/features/features.csv"
+    if not os.path.exists(features_file):
+        logger.error(f"Features file not found: {features_file}")
+        print(f"[ERROR] Features file not found: {features_file}")
+        print("[INFO] Run feature engineering first")
+        return model, None, version
+
+    df = load_features_lean(features_file) if lean else pd.read_csv(features_file)
+    logger.info(f"Loaded {len(df)} records from features.csv")
+    return model, df, version
+
+
+def _score(model, df: pd.DataFrame, lean: bool = False, cache: PredictionCache = None,
+           version: str = None) -> pd.DataFrame:
+    """Add prediction, label, confidence and predicted price columns"""
+    # Prepare features for prediction
+    X = df.drop(columns=["target"] + METADATA_COLUMNS, errors="ignore")
+    if lean:
+        # Models trained by train_lean() were fitted on float32 arrays
+        X = to_model_matrix(X)
+        memory_report("prediction input (lean)", None, X)
+
+    # Generate predictions, reusing cached outputs for unchanged rows
+    cached_confidence = None
+    if cache is not None:
+        predictions, cached_confidence = cache.score(model, X, version or model_version())
+        logger.info(f"Prediction cache: {cache.stats()}")
+    else:
         predictions = model.predict(X)
-        df["prediction"] = predictions
-        
-        # Convert regression predictions to binary (UP/DOWN) if needed
-        # Threshold: > 0.5 = UP (1), <= 0.5 = DOWN (0)
-        if predictions.dtype in ['float64', 'float32']:
-            df["prediction_binary"] = (predictions > 0.5).astype(int)
-            df["prediction_label"] = df["prediction_binary"].map({1: "UP", 0: "DOWN"})
+    df["prediction"] = predictions
+
+    # Convert regression predictions to binary (UP/DOWN) if needed
+    # Threshold: > 0.5 = UP (1), <= 0.5 = DOWN (0)
+    if predictions.dtype in ['float64', 'float32']:
+        df["prediction_binary"] = (predictions > 0.5).astype(int)
+        df["prediction_label"] = df["prediction_binary"].map({1: "UP", 0: "DOWN"})
+    else:
+        # Already binary
+        df["prediction_binary"] = predictions
+        df["prediction_label"] = df["prediction_binary"].map({1: "UP", 0: "DOWN"})
+
+    # Add confidence score
+    try:
+        if cached_confidence is not None:
+            df["confidence"] = cached_confidence
+        elif hasattr(model, "predict_proba"):
+            # Classification model
+            proba = model.predict_proba(X)
+            df["confidence"] = proba.max(axis=1)
         else:
-            # Already binary
-            df["prediction_binary"] = predictions
-            df["prediction_label"] = df["prediction_binary"].map({1: "UP", 0: "DOWN"})
-        
-        # Add confidence score
-        try:
-            if hasattr(model, "predict_proba"):
-                # Classification model
-                proba = model.predict_proba(X)
-                df["confidence"] = proba.max(axis=1)
-            else:
-                # Regression model - calculate confidence based on prediction distance from threshold
-                # Predictions closer to 0 or 1 are more confident
-                df["confidence"] = abs(predictions - 0.5) * 2  # Scale to 0-1
-        except:
-            # Fallback confidence calculation
-            if predictions.dtype in ['float64', 'float32']:
-                df["confidence"] = abs(predictions - 0.5) * 2
-            else:
-                df["confidence"] = 0.7
-        
-        # Try to merge with historical prices to get symbol and datetime
-        historical_file = "data/raw/prices/historical_prices.csv"
-        if os.path.exists(historical_file):
-            try:
-                historical_df = pd.read_csv(historical_file)
-                
-                # If historical data has symbol and datetime, try to merge
-                if "symbol" in historical_df.columns and "Datetime" in historical_df.columns:
-                    # Match by index or by Close price
-                    if "Close" in df.columns and "Close" in historical_df.columns:
-                        # Merge on Close price (approximate match)
-                        historical_df = historical_df.sort_values("Datetime").reset_index(drop=True)
-                        df = df.reset_index(drop=True)
-                        
-                        # Add symbol and datetime from historical if lengths match
-                        if len(df) <= len(historical_df):
-                            # Take the most recent records
-                            historical_subset = historical_df.tail(len(df)).reset_index(drop=True)
-                            df["symbol"] = historical_subset["symbol"].values
-                            df["datetime"] = pd.to_datetime(historical_subset["Datetime"]).values
-                            df["price"] = historical_subset["Close"].values
-                            df["predicted_price"] = df["Close"] * (1 + df["prediction"] * 0.01)  # Approximate
-                        else:
-                            # Use the latest stock from historical
-                            latest_symbol = historical_df["symbol"].iloc[-1] if len(historical_df) > 0 else Config.STOCKS[0]
-                            df["symbol"] = latest_symbol
-                            df["datetime"] = pd.to_datetime("now")
-                            df["price"] = df["Close"] if "Close" in df.columns else 0
-                            df["predicted_price"] = df["Close"] * (1 + df["prediction"] * 0.01) if "Close" in df.columns else 0
-                    else:
-                        # Fallback: use first stock from config
-                        df["symbol"] = Config.STOCKS[0] if Config.STOCKS else "AAPL"
-                        df["datetime"] = pd.to_datetime("now")
-                        df["price"] = df["Close"] if "Close" in df.columns else 0
-                        df["predicted_price"] = df["Close"] * (1 + df["prediction"] * 0.01) if "Close" in df.columns else 0
-                else:
-                    # No symbol in historical, use default
-                    df["symbol"] = Config.STOCKS[0] if Config.STOCKS else "AAPL"
-                    df["datetime"] = pd.to_datetime("now")
-                    df["price"] = df["Close"] if "Close" in df.columns else 0
-                    df["predicted_price"] = df["Close"] * (1 + df["prediction"] * 0.01) if "Close" in df.columns else 0
-            except Exception as e:
-                logger.warning(f"Could not merge with historical prices: {e}")
-                # Fallback: add default symbol
-                df["symbol"] = Config.STOCKS[0] if Config.STOCKS else "AAPL"
-                df["datetime"] = pd.to_datetime("now")
-                df["price"] = df["Close"] if "Close" in df.columns else 0
-                df["predicted_price"] = df["Close"] * (1 + df["prediction"] * 0.01) if "Close" in df.columns else 0
+            # Regression model - calculate confidence based on prediction distance from threshold
+            # Predictions closer to 0 or 1 are more confident
+            df["confidence"] = abs(predictions - 0.5) * 2  # Scale to 0-1
+    except:
+        # Fallback confidence calculation
+        if predictions.dtype in ['float64', 'float32']:
+            df["confidence"] = abs(predictions - 0.5) * 2
         else:
-            # No historical file, add default values
-            logger.warning("Historical prices file not found. Using default symbol.")
-            df["symbol"] = Config.STOCKS[0] if Config.STOCKS else "AAPL"
-            df["datetime"] = pd.to_datetime("now")
-            df["price"] = df["Close"] if "Close" in df.columns else 0
-            df["predicted_price"] = df["Close"] * (1 + df["prediction"] * 0.01) if "Close" in df.columns else 0
-        
+            df["confidence"] = 0.7
+
+    df["predicted_price"] = df["Close"] * (1 + df["prediction"] * 0.01) if "Close" in df.columns else 0  # Approximate
+    return df
+
+
+def _attach_metadata(df: pd.DataFrame) -> bool:
+    """
+    Add symbol, datetime and price columns from historical prices
+
+    Returns:
+        True if rows were aligned with real historical timestamps,
+        False if default symbol/current time placeholders were used
+    """
+    def use_defaults(symbol=None):
+        df["symbol"] = symbol or (Config.STOCKS[0] if Config.STOCKS else "AAPL")
+        df["datetime"] = pd.to_datetime("now")
+        df["price"] = df["Close"] if "Close" in df.columns else 0
+
+    # Try to merge with historical prices to get symbol and datetime
+    historical_file = "data/raw/prices/historical_prices.csv"
+    if not os.path.exists(historical_file):
+        # No historical file, add default values
+        logger.warning("Historical prices file not found. Using default symbol.")
+        use_defaults()
+        return False
+
+    try:
+        historical_df = pd.read_csv(historical_file)
+
+        # If historical data has symbol and datetime, try to merge
+        if "symbol" not in historical_df.columns or "Datetime" not in historical_df.columns:
+            # No symbol in historical, use default
+            use_defaults()
+            return False
+
+        # Match by index or by Close price
+        if "Close" not in df.columns or "Close" not in historical_df.columns:
+            # Fallback: use first stock from config
+            use_defaults()
+            return False
+
+        # Merge on Close price (approximate match)
+        historical_df = historical_df.sort_values("Datetime").reset_index(drop=True)
+        df.reset_index(drop=True, inplace=True)
+
+        # Add symbol and datetime from historical if lengths match
+        if len(df) <= len(historical_df):
+            # Take the most recent records
+            historical_subset = historical_df.tail(len(df)).reset_index(drop=True)
+            df["symbol"] = historical_subset["symbol"].values
+            df["datetime"] = pd.to_datetime(historical_subset["Datetime"]).values
+            df["price"] = historical_subset["Close"].values
+            return True
+
+        # Use the latest stock from historical
+        use_defaults(historical_df["symbol"].iloc[-1] if len(historical_df) > 0 else None)
+        return False
+    except Exception as e:
+        logger.warning(f"Could not merge with historical prices: {e}")
+        # Fallback: add default symbol
+        use_defaults()
+        return False
+
+
+def predict(lean: bool = False, use_cache: bool = True):
+    """
+    Generate predictions for stock prices
+
+    Args:
+        lean: Load features as float32 and score from a contiguous float32 matrix
+        use_cache: Reuse persisted outputs for rows already scored by this model
+    """
+    try:
+        model, df, version = _load_model_and_features(lean)
+        if df is None:
+            return
+
+        cache = PredictionCache() if use_cache else None
+        df = _score(model, df, lean, cache, version)
+        if cache is not None:
+            cache.save()
+        _attach_metadata(df)
+
         # Save predictions
         output_file = "data/processed/features/predictions.csv"
         os.makedirs(os.path.dirname(output_file), exist_ok=True)
         df.to_csv(output_file, index=False)
-        
+
         logger.info(f"Predictions saved to {output_file}")
         print("Predictions generated successfully!")
         print(f"Total predictions: {len(df)}")
+        if cache is not None:
+            stats = cache.stats()
+            print(f"Cache hits: {stats['hits']}, misses: {stats['misses']} ({stats['hit_rate']:.0%} hit rate)")
         if "symbol" in df.columns:
             symbols = df["symbol"].unique()
             print(f"Stocks: {', '.join(symbols)}")
-        
+
     except Exception as e:
         logger.error(f"Error generating predictions: {e}")
         print(f"Error: {e}")
 
 
+def predict_incremental(store: PredictionStore = None, lean: bool = False, use_cache: bool = True):
+    """
+    Score only feature rows newer than the last prediction watermark
+
+    Each symbol's last predicted datetime is kept by the PredictionStore;
+    new rows are scored and appended to its symbol/date partitions, so cost
+    is proportional to newly arrived bars rather than total history.
+
+    Args:
+        store: Prediction store to append to. If None, uses Config.PREDICTIONS_STORE
+        lean: Load features as float32 and score from a contiguous float32 matrix
+        use_cache: Reuse persisted outputs for rows already scored by this model
+    """
+    try:
+        model, df, version = _load_model_and_features(lean)
+        if df is None:
+            return
+
+        if not _attach_metadata(df):
+            # Placeholder timestamps are always "now", so a watermark can't tell new rows apart
+            logger.warning("No historical timestamps to align with; falling back to full prediction")
+            print("[WARN] Incremental mode needs symbol/datetime from historical prices. Running full prediction.")
+            predict(lean, use_cache)
+            return
+
+        store = store or PredictionStore()
+        new_rows = store.filter_new(df)
+        if new_rows.empty:
+            logger.info("No new feature rows since last prediction")
+            print("No new rows to predict.")
+            return
+
+        cache = PredictionCache() if use_cache else None
+        scored = _score(model, new_rows.copy(), lean, cache, version)
+        if cache is not None:
+            cache.save()
+        appended = store.append(scored)
+
+        print("Incremental predictions generated successfully!")
+        print(f"New predictions: {appended} (skipped {len(df) - appended} already scored)")
+        print(f"Stocks: {', '.join(scored['symbol'].unique())}")
+        return scored
+
+    except Exception as e:
+        logger.error(f"Error generating incremental predictions: {e}")
+        print(f"Error: {e}")
+
+
 if __name__ == "__main__":
-    predict()
+    lean = "--lean" in sys.argv
+    use_cache = "--no-cache" not in sys.argv
+    if "--incremental" in sys.argv:
+        predict_incremental(lean=lean, use_cache=use_cache)
+    else:
+        predict(lean=lean, use_cache=use_cache)
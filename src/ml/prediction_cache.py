@@ -0,0 +1,111 @@
+"""
+Persistent LRU cache of model outputs
+Keyed by (model version, feature-row hash) so repeated scoring of unchanged
+rows with the same model is a dictionary lookup instead of a model call
+"""
+import hashlib
+import os
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+import joblib
+import numpy as np
+import pandas as pd
+
+from src.utils.config import Config
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+# (path, mtime, size) -> content hash, so the model file is hashed once per version
+_VERSIONS = {}
+
+
+def model_version(model_path: str = "model.pkl") -> str:
+    """Content hash of the model file; changes whenever the model is retrained"""
+    stat = os.stat(model_path)
+    key = (os.path.abspath(model_path), stat.st_mtime_ns, stat.st_size)
+    if key not in _VERSIONS:
+        digest = hashlib.sha1()
+        with open(model_path, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                digest.update(block)
+        _VERSIONS[key] = digest.hexdigest()[:16]
+    return _VERSIONS[key]
+
+
+def hash_rows(X) -> np.ndarray:
+    """Vectorised uint64 hash of each feature row"""
+    frame = X if isinstance(X, pd.DataFrame) else pd.DataFrame(X)
+    return pd.util.hash_pandas_object(frame, index=False).to_numpy()
+
+
+class PredictionCache:
+    """Bounded LRU of (model version, row hash) -> (prediction, confidence)"""
+
+    def __init__(self, path: str = Config.PREDICTION_CACHE_FILE,
+                 max_entries: int = Config.PREDICTION_CACHE_SIZE):
+        self.path = path
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._load()
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return
+        try:
+            self._entries = joblib.load(self.path)
+        except Exception as e:
+            logger.warning(f"Could not load prediction cache {self.path}: {e}")
+            self._entries = OrderedDict()
+
+    def save(self):
+        """Persist the cache so later runs reuse it"""
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        joblib.dump(self._entries, self.path)
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+            "entries": len(self._entries),
+        }
+
+    def score(self, model, X, version: str) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+        """
+        Return predictions (and max class probability for classifiers),
+        calling the model only for rows not already cached
+
+        Returns:
+            (predictions, confidence); confidence is None for regressors
+        """
+        keys = [(version, h) for h in hash_rows(X)]
+        cached = [self._entries.get(key) for key in keys]
+        miss_idx = [i for i, value in enumerate(cached) if value is None]
+
+        self.hits += len(keys) - len(miss_idx)
+        self.misses += len(miss_idx)
+
+        if miss_idx:
+            X_miss = X.iloc[miss_idx] if isinstance(X, pd.DataFrame) else X[miss_idx]
+            predictions = model.predict(X_miss)
+            confidence = model.predict_proba(X_miss).max(axis=1) if hasattr(model, "predict_proba") else None
+            for j, i in enumerate(miss_idx):
+                cached[i] = (predictions[j].item(), None if confidence is None else confidence[j].item())
+                self._entries[keys[i]] = cached[i]
+
+        # Refresh recency for every row touched, then evict least recently used
+        for key in keys:
+            self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+        predictions = np.asarray([value[0] for value in cached])
+        if hasattr(model, "predict_proba"):
+            return predictions, np.asarray([value[1] for value in cached], dtype=float)
+        return predictions, None
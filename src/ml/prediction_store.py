@@ -0,0 +1,110 @@
+"""
+Partitioned Prediction Store
+Appends scored rows under symbol/date partitions and tracks a per-symbol
+watermark of the last predicted datetime, so incremental runs only score
+feature rows that arrived since the previous run
+"""
+import json
+import os
+from typing import Dict, List, Optional
+
+import pandas as pd
+
+from src.utils.config import Config
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class PredictionStore:
+    """Append-only prediction store partitioned by symbol and date"""
+
+    WATERMARK_FILE = "_watermark.json"
+
+    def __init__(self, base_dir: str = Config.PREDICTIONS_STORE):
+        self.base_dir = base_dir
+        os.makedirs(base_dir, exist_ok=True)
+
+    def _watermark_path(self) -> str:
+        return os.path.join(self.base_dir, self.WATERMARK_FILE)
+
+    def _partition_path(self, symbol: str, date) -> str:
+        return os.path.join(self.base_dir, f"symbol={symbol}", f"date={date}.csv")
+
+    def load_watermarks(self) -> Dict[str, pd.Timestamp]:
+        """Load the last predicted datetime per symbol"""
+        path = self._watermark_path()
+        if not os.path.exists(path):
+            return {}
+        try:
+            with open(path) as f:
+                raw = json.load(f)
+            return {symbol: pd.Timestamp(ts) for symbol, ts in raw.items()}
+        except Exception as e:
+            logger.warning(f"Could not read prediction watermark {path}: {e}")
+            return {}
+
+    def save_watermarks(self, watermarks: Dict[str, pd.Timestamp]):
+        """Persist the per-symbol watermark atomically"""
+        path = self._watermark_path()
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({symbol: ts.isoformat() for symbol, ts in watermarks.items()}, f, indent=2)
+        os.replace(tmp_path, path)
+
+    def filter_new(self, df: pd.DataFrame, watermarks: Optional[Dict[str, pd.Timestamp]] = None) -> pd.DataFrame:
+        """Return only rows whose datetime is newer than their symbol's watermark"""
+        if df.empty:
+            return df
+        watermarks = self.load_watermarks() if watermarks is None else watermarks
+        if not watermarks:
+            return df
+
+        datetimes = pd.to_datetime(df["datetime"])
+        last_seen = pd.to_datetime(df["symbol"].map(watermarks))
+        # Symbols without a watermark have NaT and are always new
+        mask = last_seen.isna() | (datetimes > last_seen)
+        return df[mask]
+
+    def append(self, df: pd.DataFrame) -> int:
+        """Append scored rows to their partitions and advance the watermarks"""
+        if df.empty:
+            return 0
+
+        df = df.copy()
+        df["datetime"] = pd.to_datetime(df["datetime"])
+        watermarks = self.load_watermarks()
+
+        for (symbol, date), part in df.groupby([df["symbol"], df["datetime"].dt.date]):
+            path = self._partition_path(symbol, date)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            part.to_csv(path, mode="a", header=not os.path.exists(path), index=False)
+
+        for symbol, latest in df.groupby("symbol")["datetime"].max().items():
+            previous = watermarks.get(symbol)
+            watermarks[symbol] = latest if previous is None else max(previous, latest)
+
+        self.save_watermarks(watermarks)
+        logger.info(f"Appended {len(df)} predictions to {self.base_dir}")
+        return len(df)
+
+    def load(self, symbols: List[str] = None) -> pd.DataFrame:
+        """Read stored predictions, touching only the requested symbol partitions"""
+        if not os.path.isdir(self.base_dir):
+            return pd.DataFrame()
+
+        symbol_dirs = [d for d in os.listdir(self.base_dir) if d.startswith("symbol=")]
+        if symbols:
+            wanted = {f"symbol={symbol}" for symbol in symbols}
+            symbol_dirs = [d for d in symbol_dirs if d in wanted]
+
+        frames = []
+        for symbol_dir in sorted(symbol_dirs):
+            full_dir = os.path.join(self.base_dir, symbol_dir)
+            for filename in sorted(os.listdir(full_dir)):
+                if filename.endswith(".csv"):
+                    frames.append(pd.read_csv(os.path.join(full_dir, filename)))
+
+        if frames:
+            return pd.concat(frames, ignore_index=True)
+        return pd.DataFrame()
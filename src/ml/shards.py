@@ -0,0 +1,38 @@
+"""
+Feature shard iteration for out-of-core training
+Streams features.csv in chunks, or a Parquet file by row batches, as lean
+float32 frames so only one shard is resident at a time
+"""
+from typing import Iterator
+
+import pandas as pd
+
+from src.ml.lean_data import lean_dtypes, epoch_time_columns, SYMBOL_COLUMNS, TIME_COLUMNS
+
+try:
+    import pyarrow.parquet as pq
+except ImportError:
+    pq = None
+
+
+def iter_feature_shards(path: str, shard_rows: int) -> Iterator[pd.DataFrame]:
+    """
+    Yield feature shards of at most shard_rows rows
+
+    Args:
+        path: features.csv or a .parquet file
+        shard_rows: Maximum rows per shard; peak memory scales with this
+    """
+    if path.endswith(".parquet"):
+        if pq is None:
+            raise ImportError("pyarrow is required to stream Parquet shards: pip install pyarrow")
+        parquet_file = pq.ParquetFile(path)
+        for batch in parquet_file.iter_batches(batch_size=shard_rows):
+            df = batch.to_pandas()
+            numeric = [c for c in df.columns if c not in SYMBOL_COLUMNS and c not in TIME_COLUMNS]
+            df[numeric] = df[numeric].astype("float32")
+            yield epoch_time_columns(df)
+        return
+
+    for df in pd.read_csv(path, dtype=lean_dtypes(path), chunksize=shard_rows):
+        yield epoch_time_columns(df)
@@ -1,9 +1,28 @@
 from sklearn.model_selection import train_test_split
 from sklearn.ensemble import RandomForestRegressor
+from sklearn.linear_model import SGDRegressor
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import StandardScaler
 import pandas as pd
+import numpy as np
 import joblib
+import json
+import os
+import sys
+from datetime import datetime
+from src.ml.lean_data import load_features_lean, to_model_matrix, shuffle_split, memory_report
+from src.ml.shards import iter_feature_shards
+from src.utils.config import Config
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+MODEL_META_FILE = "model_meta.json"
+
+def train(lean: bool = False):
+    if lean:
+        return train_lean()
 
-def train():
     df = pd.read_csv("data/processed/features/features.csv")
 
     X = df.drop("target", axis=1)
@@ -16,5 +35,157 @@ def train():
 
     joblib.dump(model, "model.pkl")
 
+def train_lean():
+    """Train on float32 C-contiguous arrays without split copies"""
+    memory_report("before load")
+    df = load_features_lean("data/processed/features/features.csv")
+
+    X = to_model_matrix(df)
+    y = df["target"].to_numpy(dtype=np.float32, copy=True)
+    del df
+    memory_report("features as arrays", None, X, y)
+
+    X_train, X_test, y_train, y_test = shuffle_split(X, y, test_size=0.2)
+
+    model = RandomForestRegressor()
+    model.fit(X_train, y_train)
+    memory_report("after fit", None, X, y)
+
+    joblib.dump(model, "model.pkl")
+
+def train_out_of_core(path: str = "data/processed/features/features.csv",
+                      shard_rows: int = Config.TRAIN_SHARD_ROWS, epochs: int = 3,
+                      holdout: float = 0.2):
+    """
+    Train an incremental linear model by streaming feature shards
+
+    Only one shard of at most shard_rows rows is held in memory. A first
+    pass fits the scaler, then each epoch partial_fits the regressor on the
+    leading rows of every shard and scores the trailing holdout fraction.
+
+    Args:
+        path: features.csv or a .parquet file
+        shard_rows: Rows per shard; bounds peak memory
+        epochs: Passes over the shards for the regressor
+        holdout: Fraction of each shard kept out of fitting for evaluation
+    """
+    scaler = StandardScaler()
+    for shard in iter_feature_shards(path, shard_rows):
+        scaler.partial_fit(to_model_matrix(shard))
+
+    model = SGDRegressor()
+    for epoch in range(epochs):
+        sq_error, n_scored = 0.0, 0
+        for shard in iter_feature_shards(path, shard_rows):
+            X = scaler.transform(to_model_matrix(shard))
+            y = shard["target"].to_numpy(dtype=np.float32)
+            n_train = len(X) - int(len(X) * holdout)
+
+            if n_train > 0:
+                model.partial_fit(X[:n_train], y[:n_train])
+            if n_train < len(X):
+                residual = model.predict(X[n_train:]) - y[n_train:]
+                sq_error += float(np.dot(residual, residual))
+                n_scored += len(residual)
+
+        mse = sq_error / n_scored if n_scored else float("nan")
+        logger.info(f"Out-of-core epoch {epoch + 1}/{epochs}: holdout MSE={mse:.6f}")
+        memory_report(f"out-of-core epoch {epoch + 1}")
+
+    joblib.dump(Pipeline([("scaler", scaler), ("model", model)]), "model.pkl")
+
+def _load_model_meta() -> dict:
+    if not os.path.exists(MODEL_META_FILE):
+        return {}
+    with open(MODEL_META_FILE) as f:
+        return json.load(f)
+
+def _save_model_meta(meta: dict):
+    with open(MODEL_META_FILE, "w") as f:
+        json.dump(meta, f, indent=2)
+
+def retrain_warm_start(path: str = "data/processed/features/features.csv",
+                       trees_per_window: int = 20, max_trees: int = None):
+    """
+    Grow the existing forest on rows added since the last (re)train
+
+    New trees are fitted on the newest window only via warm_start, so each
+    retrain costs time proportional to new data. When max_trees is set the
+    oldest tree blocks are retired to keep the ensemble rolling forward.
+    model_meta.json records the feature-row window each block of trees saw.
+
+    Args:
+        path: Features CSV; rows are assumed to be appended in time order
+        trees_per_window: Trees added for each new window
+        max_trees: Retire oldest blocks beyond this many trees (None keeps all)
+    """
+    meta = _load_model_meta()
+    model = joblib.load("model.pkl") if os.path.exists("model.pkl") else None
+
+    blocks = meta.get("tree_blocks", [])
+    tracked = isinstance(model, RandomForestRegressor) and blocks and \
+        sum(block["n_trees"] for block in blocks) == len(model.estimators_)
+
+    if model is not None and not isinstance(model, RandomForestRegressor):
+        logger.error("Warm-start retrain needs a RandomForestRegressor in model.pkl")
+        print("❌ model.pkl is not a random forest (lean/out-of-core model?). "
+              "Run a full train first: python -m src.ml.train_model")
+        return None
+
+    if model is not None and not tracked:
+        # Forest trained outside warm start (e.g. a full train()): adopt it as
+        # one seed block covering every current row instead of replacing it
+        n_rows = len(pd.read_csv(path, usecols=["target"]))
+        model.set_params(warm_start=True)
+        meta = {"tree_blocks": [{
+            "start_row": 0, "end_row": n_rows, "n_trees": len(model.estimators_),
+            "trained_at": datetime.now().isoformat()
+        }]}
+        logger.info(f"Warm-start: adopted existing forest of {len(model.estimators_)} trees over {n_rows} rows")
+        print(f"Adopted existing {len(model.estimators_)}-tree model; later retrains add trees for new rows.")
+    elif model is None:
+        # No model yet: seed one with a single block over the whole file
+        df = pd.read_csv(path)
+        model = RandomForestRegressor(n_estimators=trees_per_window, warm_start=True)
+        model.fit(df.drop("target", axis=1), df["target"])
+        meta = {"tree_blocks": [{
+            "start_row": 0, "end_row": len(df), "n_trees": trees_per_window,
+            "trained_at": datetime.now().isoformat()
+        }]}
+        logger.info(f"Warm-start seed: {trees_per_window} trees on {len(df)} rows")
+    else:
+        start_row = meta["tree_blocks"][-1]["end_row"]
+        # Skip already-seen data rows but keep the header
+        df = pd.read_csv(path, skiprows=range(1, start_row + 1))
+        if df.empty:
+            logger.info("Warm-start retrain: no new rows since last window")
+            print("No new feature rows to train on.")
+            return model
+
+        model.set_params(warm_start=True, n_estimators=len(model.estimators_) + trees_per_window)
+        model.fit(df.drop("target", axis=1), df["target"])
+        meta["tree_blocks"].append({
+            "start_row": start_row, "end_row": start_row + len(df), "n_trees": trees_per_window,
+            "trained_at": datetime.now().isoformat()
+        })
+        logger.info(f"Warm-start retrain: added {trees_per_window} trees on rows {start_row}-{start_row + len(df)}")
+
+        if max_trees:
+            while len(meta["tree_blocks"]) > 1 and len(model.estimators_) > max_trees:
+                retired = meta["tree_blocks"].pop(0)
+                # Blocks are appended in order, so the oldest trees lead estimators_
+                model.estimators_ = model.estimators_[retired["n_trees"]:]
+                logger.info(f"Retired {retired['n_trees']} trees from rows {retired['start_row']}-{retired['end_row']}")
+            model.n_estimators = len(model.estimators_)
+
+    joblib.dump(model, "model.pkl")
+    _save_model_meta(meta)
+    return model
+
 if __name__ == "__main__":
-    train()
+    if "--warm-start" in sys.argv:
+        retrain_warm_start()
+    elif "--out-of-core" in sys.argv:
+        train_out_of_core()
+    else:
+        train(lean="--lean" in sys.argv)
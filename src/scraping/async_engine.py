@@ -0,0 +1,118 @@
+"""
+Asyncio scraping engine with per-domain rate limits
+Fans out every (symbol, source) request at once; each domain has its own
+token bucket (sustained rate + burst) and cap on in-flight requests, so
+total wall time is set by the slowest domain's rate limit rather than by
+symbols x sources. Blocking fetch+parse calls run on a dedicated thread
+pool sized to the total in-flight budget, reusing the scraper's pooled
+keep-alive sessions.
+"""
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Tuple
+
+import pandas as pd
+
+from src.utils.config import Config
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class TokenBucket:
+    """Async token bucket: `rate` tokens per second, up to `burst` saved"""
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.capacity = max(burst, 1)
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+class DomainLimiter:
+    """Token bucket plus in-flight semaphore for one domain"""
+
+    def __init__(self, rate: float, burst: int, max_in_flight: int):
+        self.bucket = TokenBucket(rate, burst)
+        self.in_flight = asyncio.Semaphore(max_in_flight)
+        self.max_in_flight = max_in_flight
+
+
+def domain_limits(domain: str) -> Tuple[float, int, int]:
+    """(rate per second, burst, max in flight) for a domain, with per-domain overrides"""
+    defaults = (Config.SCRAPER_RATE_PER_DOMAIN, Config.SCRAPER_BURST, Config.SCRAPER_MAX_IN_FLIGHT)
+    return tuple(Config.SCRAPER_DOMAIN_LIMITS.get(domain, defaults))
+
+
+class AsyncScrapeEngine:
+    """Concurrent (symbol, source) fan-out for a MultiSourceScraper"""
+
+    def __init__(self, scraper, timeout: float = 2 * Config.SCRAPER_TIMEOUT):
+        self.scraper = scraper
+        self.timeout = timeout
+
+    async def _scrape_one(self, source: str, symbol: str, limiter: DomainLimiter,
+                          executor: ThreadPoolExecutor) -> pd.DataFrame:
+        await limiter.bucket.acquire()
+        async with limiter.in_flight:
+            loop = asyncio.get_running_loop()
+            try:
+                return await asyncio.wait_for(
+                    loop.run_in_executor(executor, self.scraper.scrape_source, source, symbol), self.timeout
+                )
+            except asyncio.TimeoutError:
+                logger.error(f"{source} timed out for {symbol} after {self.timeout}s")
+            except Exception as e:
+                logger.error(f"Error in {source} for {symbol}: {e}")
+            return pd.DataFrame()
+
+    async def scrape(self, symbols: List[str]) -> List[pd.DataFrame]:
+        sources = self.scraper.sources()
+        limiters: Dict[str, DomainLimiter] = {}
+        for source in sources:
+            domain = self.scraper.source_domain(source)
+            if domain not in limiters:
+                limiters[domain] = DomainLimiter(*domain_limits(domain))
+
+        workers = sum(limiter.max_in_flight for limiter in limiters.values())
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="scrape") as executor:
+            tasks = [
+                self._scrape_one(source, symbol, limiters[self.scraper.source_domain(source)], executor)
+                for symbol in symbols for source in sources
+            ]
+            frames = await asyncio.gather(*tasks)
+
+        logger.info(f"Async engine: {len(tasks)} requests across {len(limiters)} domains "
+                    f"in {time.perf_counter() - start:.1f}s")
+        return [df for df in frames if not df.empty]
+
+    def run(self, symbols: List[str]) -> List[pd.DataFrame]:
+        """
+        Blocking entry point; returns the non-empty per-(symbol, source) frames
+
+        Async callers can await scrape() directly. When run() is called from a
+        thread whose event loop is already running (notebooks, Streamlit),
+        asyncio.run() would raise, so the scrape gets its own loop on a worker
+        thread instead.
+        """
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(self.scrape(symbols))
+
+        with ThreadPoolExecutor(max_workers=1, thread_name_prefix="scrape-loop") as executor:
+            return executor.submit(asyncio.run, self.scrape(symbols)).result()
@@ -0,0 +1,227 @@
+"""
+Reusable headless Chrome pool
+Long-lived drivers are checked out per page instead of launching Chrome
+for every run; pages load eagerly with images and web fonts blocked, and
+scrapes wait for the target elements explicitly instead of sleeping.
+"""
+import queue
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Dict, List
+
+from selenium import webdriver
+from selenium.common.exceptions import TimeoutException, WebDriverException
+from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.support.ui import WebDriverWait
+
+from src.utils.config import Config
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Requests Chrome drops before they hit the network
+BLOCKED_RESOURCES = [
+    "*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.svg", "*.ico",
+    "*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot",
+]
+
+
+def chrome_options(headless: bool = True) -> Options:
+    options = Options()
+    if headless:
+        options.add_argument("--headless=new")
+    options.add_argument("--disable-blink-features=AutomationControlled")
+    options.add_argument("--blink-settings=imagesEnabled=false")
+    options.add_argument("--disable-gpu")
+    options.add_argument("--no-sandbox")
+    options.add_argument("--disable-dev-shm-usage")
+    options.add_experimental_option("excludeSwitches", ["enable-automation"])
+    options.add_experimental_option("useAutomationExtension", False)
+    options.add_experimental_option("prefs", {"profile.managed_default_content_settings.images": 2})
+    # Return from get() at DOMContentLoaded; explicit waits cover late JS content
+    options.page_load_strategy = "eager"
+    return options
+
+
+class BrowserPool:
+    """Fixed-size pool of headless Chrome drivers shared across threads"""
+
+    def __init__(self, size: int = Config.SELENIUM_POOL_SIZE, headless: bool = True,
+                 wait_timeout: float = Config.SELENIUM_WAIT_TIMEOUT):
+        self.size = size
+        self.headless = headless
+        self.wait_timeout = wait_timeout
+        self._idle = queue.Queue()
+        self._created = 0
+        self._lock = threading.Lock()
+
+    def _new_driver(self) -> webdriver.Chrome:
+        driver = webdriver.Chrome(options=chrome_options(self.headless))
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": BLOCKED_RESOURCES})
+        return driver
+
+    @contextmanager
+    def driver(self):
+        """Check out a driver, starting one if the pool isn't full yet"""
+        try:
+            driver = self._idle.get_nowait()
+        except queue.Empty:
+            with self._lock:
+                start_new = self._created < self.size
+                if start_new:
+                    self._created += 1
+            if start_new:
+                try:
+                    driver = self._new_driver()
+                except Exception:
+                    with self._lock:
+                        self._created -= 1
+                    raise
+            else:
+                driver = self._idle.get()
+
+        healthy = True
+        try:
+            yield driver
+        except WebDriverException:
+            healthy = False
+            raise
+        finally:
+            if healthy:
+                self._idle.put(driver)
+            else:
+                # A crashed browser is replaced on the next checkout
+                with self._lock:
+                    self._created -= 1
+                try:
+                    driver.quit()
+                except Exception:
+                    pass
+
+    def fetch_links(self, url: str, xpath: str, min_length: int = 16) -> List[Dict]:
+        """Load url and return {headline, url} for elements matching xpath once they appear"""
+        with self.driver() as driver:
+            driver.get(url)
+            try:
+                elements = WebDriverWait(driver, self.wait_timeout).until(
+                    EC.presence_of_all_elements_located((By.XPATH, xpath))
+                )
+            except TimeoutException:
+                logger.warning(f"No elements matching {xpath} on {url} after {self.wait_timeout}s")
+                return []
+            links = []
+            for element in elements:
+                text = element.text.strip()
+                if len(text) >= min_length:
+                    links.append({"headline": text, "url": element.get_attribute("href")})
+            return links
+
+    def fetch_many(self, urls: List[str], xpath: str, min_length: int = 16) -> Dict[str, List[Dict]]:
+        """Scrape several pages concurrently, one page per pooled driver at a time"""
+        with ThreadPoolExecutor(max_workers=self.size) as executor:
+            futures = {url: executor.submit(self.fetch_links, url, xpath, min_length) for url in urls}
+        results = {}
+        for url, future in futures.items():
+            try:
+                results[url] = future.result()
+            except Exception as e:
+                logger.error(f"Browser scrape failed for {url}: {e}")
+                results[url] = []
+        return results
+
+    def close(self):
+        while True:
+            try:
+                driver = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            try:
+                driver.quit()
+            except Exception:
+                pass
+        with self._lock:
+            self._created = 0
+
+
+_FIXTURE_PAGE = """<html><head>
+<link rel="stylesheet" href="/font.woff2"><img src="/big.png">
+</head><body><div id="feed"></div><script>
+// Headlines arrive after a client-side delay, like JS-rendered news feeds
+setTimeout(function () {{
+  var feed = document.getElementById("feed");
+  for (var i = 0; i < 20; i++) {{
+    var a = document.createElement("a");
+    a.setAttribute("role", "heading");
+    a.href = "/story/" + i;
+    a.textContent = "Fixture headline number " + i + " about markets";
+    feed.appendChild(a);
+  }}
+}}, {delay_ms});
+</script></body></html>"""
+
+
+def _serve_fixture(delay_ms: int):
+    """Serve the fixture page on a free localhost port; returns the server"""
+    import http.server
+    import socketserver
+
+    page = _FIXTURE_PAGE.format(delay_ms=delay_ms).encode("utf-8")
+
+    class Handler(http.server.BaseHTTPRequestHandler):
+        def do_GET(self):
+            body = page if self.path.startswith("/news") else b""
+            self.send_response(200 if body else 404)
+            self.send_header("Content-Type", "text/html")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = socketserver.ThreadingTCPServer(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def benchmark(pages: int = 12, delay_ms: int = 500, size: int = Config.SELENIUM_POOL_SIZE):
+    """Per-page latency against a local fixture server whose headlines render after delay_ms"""
+    server = _serve_fixture(delay_ms)
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    urls = [f"{base}/news/{i}" for i in range(pages)]
+    pool = BrowserPool(size=size)
+    try:
+        start = time.perf_counter()
+        pool.fetch_links(urls[0], "//a[@role='heading']")
+        cold = time.perf_counter() - start
+
+        latencies = []
+        for url in urls:
+            start = time.perf_counter()
+            found = pool.fetch_links(url, "//a[@role='heading']")
+            latencies.append(time.perf_counter() - start)
+            assert found, f"no headlines found on {url}"
+
+        start = time.perf_counter()
+        pool.fetch_many(urls, "//a[@role='heading']")
+        concurrent = time.perf_counter() - start
+    finally:
+        pool.close()
+        server.shutdown()
+
+    print(f"First page (driver start): {cold:.2f}s")
+    print(f"Warm page latency: mean {sum(latencies) / len(latencies):.2f}s, max {max(latencies):.2f}s "
+          f"(content delay {delay_ms / 1000:.2f}s; the old scraper slept 10s per run)")
+    print(f"{pages} pages across {size} drivers: {concurrent:.2f}s ({pages / concurrent:.1f} pages/s)")
+
+
+if __name__ == "__main__":
+    if "--benchmark" in sys.argv:
+        benchmark()
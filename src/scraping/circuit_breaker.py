@@ -0,0 +1,135 @@
+"""
+Per-source circuit breakers with health metrics
+A source that fails or blocks us several times in a row is opened and
+skipped instantly instead of costing a full request timeout per symbol.
+After an exponentially growing, jittered cooldown one half-open probe is
+let through; success closes the breaker, failure re-opens it for longer.
+"""
+import random
+import threading
+import time
+from collections import deque
+from typing import Dict
+
+import numpy as np
+import pandas as pd
+
+from src.utils.config import Config
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+
+class CircuitBreaker:
+    """Consecutive-failure breaker for one source"""
+
+    def __init__(self, name: str, failure_threshold: int = Config.BREAKER_FAILURE_THRESHOLD,
+                 base_cooldown: float = Config.BREAKER_BASE_COOLDOWN,
+                 max_cooldown: float = Config.BREAKER_MAX_COOLDOWN):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.base_cooldown = base_cooldown
+        self.max_cooldown = max_cooldown
+        self.state = CLOSED
+        self.consecutive_failures = 0
+        self.open_count = 0
+        self.retry_at = 0.0
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+        # Health metrics
+        self.successes = 0
+        self.failures = 0
+        self.blocked = 0
+        self.skipped = 0
+        self.latencies = deque(maxlen=200)
+
+    def allow(self) -> bool:
+        """Whether a request may go out now; counts a skip if not"""
+        with self._lock:
+            if self.state == CLOSED:
+                return True
+            if self.state == OPEN and time.monotonic() >= self.retry_at:
+                self.state = HALF_OPEN
+            if self.state == HALF_OPEN and not self._probe_in_flight:
+                # Exactly one probe; concurrent callers keep skipping until it reports
+                self._probe_in_flight = True
+                logger.info(f"Circuit {self.name}: half-open, sending probe")
+                return True
+            self.skipped += 1
+            return False
+
+    def record_success(self, latency: float):
+        with self._lock:
+            self.successes += 1
+            self.latencies.append(latency)
+            if self.state != CLOSED:
+                logger.info(f"Circuit {self.name}: probe succeeded, closing")
+            self.state = CLOSED
+            self.consecutive_failures = 0
+            self.open_count = 0
+            self._probe_in_flight = False
+
+    def record_failure(self, latency: float, blocked: bool = False):
+        with self._lock:
+            self.failures += 1
+            self.blocked += int(blocked)
+            self.latencies.append(latency)
+            self.consecutive_failures += 1
+            # Requests already in flight when the breaker opened still report
+            # here; only a closed breaker hitting the threshold or a failed
+            # probe (re-)opens it, so they don't stretch the cooldown
+            if self.state == HALF_OPEN and self._probe_in_flight:
+                self._open()
+            elif self.state == CLOSED and self.consecutive_failures >= self.failure_threshold:
+                self._open()
+
+    def _open(self):
+        self.open_count += 1
+        # Exponential backoff with full jitter in [cooldown / 2, cooldown]
+        cooldown = min(self.base_cooldown * 2 ** (self.open_count - 1), self.max_cooldown)
+        cooldown = random.uniform(cooldown / 2, cooldown)
+        self.state = OPEN
+        self.retry_at = time.monotonic() + cooldown
+        self._probe_in_flight = False
+        logger.warning(f"Circuit {self.name}: open for {cooldown:.0f}s after "
+                       f"{self.consecutive_failures} consecutive failures")
+
+    def health(self) -> dict:
+        with self._lock:
+            attempts = self.successes + self.failures
+            latencies = np.array(self.latencies) if self.latencies else None
+            return {
+                "source": self.name,
+                "state": self.state,
+                "attempts": attempts,
+                "success_rate": round(self.successes / attempts, 3) if attempts else None,
+                "blocked": self.blocked,
+                "skipped": self.skipped,
+                "mean_latency_s": round(float(latencies.mean()), 3) if latencies is not None else None,
+                "p95_latency_s": round(float(np.percentile(latencies, 95)), 3) if latencies is not None else None,
+            }
+
+
+class BreakerRegistry:
+    """Lazily created breaker per source name"""
+
+    def __init__(self):
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._lock = threading.Lock()
+
+    def get(self, name: str) -> CircuitBreaker:
+        with self._lock:
+            if name not in self._breakers:
+                self._breakers[name] = CircuitBreaker(name)
+            return self._breakers[name]
+
+    def health(self) -> pd.DataFrame:
+        with self._lock:
+            breakers = list(self._breakers.values())
+        return pd.DataFrame([breaker.health() for breaker in breakers])
+
+    def log_health(self):
+        for row in self.health().to_dict("records"):
+            logger.info(f"Source health: {row}")
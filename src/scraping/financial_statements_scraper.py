@@ -2,146 +2,183 @@
 Enhanced Comprehensive Financial Statements Scraper
 Scrapes Income Statement, Balance Sheet, and Cash Flow Statement
 Supports multiple data sources including SEC EDGAR
+All statements of a symbol are fetched together from one yf.Ticker and
+persisted per symbol; re-scrapes within Config.FUNDAMENTALS_CACHE_TTL are
+served from disk without any remote call.
 """
-print("RUNNING FILE:", __file__)
+import os
+import sys
+import threading
+import time
 
+import joblib
 import yfinance as yf
 import pandas as pd
 from typing import List, Dict, Optional
 from datetime import datetime, timedelta
 from concurrent.futures import ThreadPoolExecutor, as_completed
+from src.utils.config import Config
 from src.utils.helpers import save_csv
 from src.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+# Statement key -> (label, annual Ticker attribute, quarterly Ticker attribute)
+STATEMENTS = {
+    "income_statement": ("Income Statement", "financials", "quarterly_financials"),
+    "balance_sheet": ("Balance Sheet", "balance_sheet", "quarterly_balance_sheet"),
+    "cash_flow": ("Cash Flow", "cashflow", "quarterly_cashflow"),
+}
+
 
 class FinancialStatementsScraper:
     """Scraper for company financial statements"""
     
-    def __init__(self, symbols: List[str] = None):
+    def __init__(self, symbols: List[str] = None, cache_dir: str = Config.FUNDAMENTALS_CACHE_DIR,
+                 ttl: float = Config.FUNDAMENTALS_CACHE_TTL, refresh: bool = False):
         self.symbols = symbols or ["AAPL", "MSFT", "TSLA", "GOOG"]
         self.statements = {}
+        self.cache_dir = cache_dir
+        self.ttl = ttl
+        # refresh=True ignores cached statements (they are still rewritten)
+        self.refresh = refresh
+        # Incremented from the symbol thread pool
+        self.cache_hits = 0
+        self.remote_fetches = 0
+        self._counts_lock = threading.Lock()
     
-    def scrape_income_statement(self, symbol: str, periods: int = 4) -> pd.DataFrame:
-        """Scrape Income Statement with historical data"""
+    def _cache_path(self, symbol: str) -> str:
+        return os.path.join(self.cache_dir, f"{symbol}.joblib")
+    
+    def _load_cached(self, symbol: str) -> Optional[dict]:
+        path = self._cache_path(symbol)
+        if not os.path.exists(path):
+            return None
         try:
-            stock = yf.Ticker(symbol)
-            income_stmt = stock.financials
-            
-            if income_stmt.empty:
-                logger.warning(f"No income statement data for {symbol}")
-                return pd.DataFrame()
-            
-            # Get quarterly data if available
-            try:
-                quarterly_stmt = stock.quarterly_financials
-                if not quarterly_stmt.empty:
-                    # Combine annual and quarterly
-                    income_stmt = pd.concat([income_stmt, quarterly_stmt], axis=1)
-                    income_stmt = income_stmt.loc[:, ~income_stmt.columns.duplicated()]
-            except:
-                pass
-            
-            # Transpose and add metadata
-            df = income_stmt.T.reset_index()
-            df.columns = ['Date'] + list(income_stmt.index)
-            df['symbol'] = symbol
-            df['statement_type'] = 'Income Statement'
-            df['scraped_at'] = datetime.now().isoformat()
-            
-            # Sort by date (most recent first)
-            if 'Date' in df.columns:
-                df['Date'] = pd.to_datetime(df['Date'], errors='coerce')
-                df = df.sort_values('Date', ascending=False)
-            
-            logger.info(f"Income Statement: Scraped {len(df)} periods for {symbol}")
-            return df
+            return joblib.load(path)
         except Exception as e:
-            logger.error(f"Income Statement scraping failed for {symbol}: {e}")
-            return pd.DataFrame()
+            logger.warning(f"Could not read cached statements {path}: {e}")
+            return None
     
-    def scrape_balance_sheet(self, symbol: str, periods: int = 4) -> pd.DataFrame:
-        """Scrape Balance Sheet with historical data"""
+    def _save_cached(self, symbol: str, entry: dict):
+        path = self._cache_path(symbol)
+        os.makedirs(self.cache_dir, exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        joblib.dump(entry, tmp_path)
+        os.replace(tmp_path, path)
+    
+    def fetch_statements(self, symbol: str) -> dict:
+        """
+        Raw annual and quarterly statement frames for a symbol
+        
+        Served from the per-symbol cache while it is younger than the TTL;
+        otherwise every statement is read from a single yf.Ticker and cached.
+        If the fetch fails, a stale cached copy is returned when there is one.
+        
+        Returns:
+            {"fetched_at": epoch seconds, "frames": {Ticker attribute: DataFrame}}
+        """
+        cached = self._load_cached(symbol)
+        if cached is not None and not self.refresh and time.time() - cached["fetched_at"] < self.ttl:
+            with self._counts_lock:
+                self.cache_hits += 1
+            return cached
+        
         try:
             stock = yf.Ticker(symbol)
-            balance_sheet = stock.balance_sheet
-            
-            if balance_sheet.empty:
-                logger.warning(f"No balance sheet data for {symbol}")
-                return pd.DataFrame()
-            
-            # Get quarterly data if available
-            try:
-                quarterly_bs = stock.quarterly_balance_sheet
-                if not quarterly_bs.empty:
-                    balance_sheet = pd.concat([balance_sheet, quarterly_bs], axis=1)
-                    balance_sheet = balance_sheet.loc[:, ~balance_sheet.columns.duplicated()]
-            except:
-                pass
-            
-            # Transpose and add metadata
-            df = balance_sheet.T.reset_index()
-            df.columns = ['Date'] + list(balance_sheet.index)
-            df['symbol'] = symbol
-            df['statement_type'] = 'Balance Sheet'
-            df['scraped_at'] = datetime.now().isoformat()
-            
-            # Sort by date (most recent first)
-            if 'Date' in df.columns:
-                df['Date'] = pd.to_datetime(df['Date'], errors='coerce')
-                df = df.sort_values('Date', ascending=False)
-            
-            logger.info(f"Balance Sheet: Scraped {len(df)} periods for {symbol}")
-            return df
+            frames = {}
+            for label, annual_attr, quarterly_attr in STATEMENTS.values():
+                frames[annual_attr] = getattr(stock, annual_attr)
+                try:
+                    frames[quarterly_attr] = getattr(stock, quarterly_attr)
+                except Exception as e:
+                    logger.warning(f"No quarterly {label.lower()} data for {symbol}: {e}")
+                    frames[quarterly_attr] = pd.DataFrame()
         except Exception as e:
-            logger.error(f"Balance Sheet scraping failed for {symbol}: {e}")
+            if cached is not None:
+                logger.warning(f"Statement fetch failed for {symbol}, using cached copy: {e}")
+                return cached
+            raise
+        
+        entry = {"fetched_at": time.time(), "frames": frames}
+        if all(frames[annual_attr] is None or frames[annual_attr].empty
+               for _, annual_attr, _ in STATEMENTS.values()):
+            # yfinance answers throttling/errors with empty frames rather than
+            # raising; never let that replace (or pose as) good statements
+            if cached is not None:
+                logger.warning(f"Empty statement fetch for {symbol}, using cached copy")
+                return cached
+            logger.warning(f"Empty statement fetch for {symbol}, not caching")
+            return entry
+        
+        with self._counts_lock:
+            self.remote_fetches += 1
+        self._save_cached(symbol, entry)
+        return entry
+    
+    def _build_statement(self, symbol: str, key: str, entry: dict) -> pd.DataFrame:
+        """One statement as rows per period (annual + quarterly), most recent first"""
+        label, annual_attr, quarterly_attr = STATEMENTS[key]
+        statement = entry["frames"][annual_attr]
+        
+        if statement is None or statement.empty:
+            logger.warning(f"No {label.lower()} data for {symbol}")
             return pd.DataFrame()
+        
+        quarterly = entry["frames"].get(quarterly_attr)
+        if quarterly is not None and not quarterly.empty:
+            # Combine annual and quarterly
+            statement = pd.concat([statement, quarterly], axis=1)
+            statement = statement.loc[:, ~statement.columns.duplicated()]
+        
+        # Transpose and add metadata
+        df = statement.T.reset_index()
+        df.columns = ['Date'] + list(statement.index)
+        df['symbol'] = symbol
+        df['statement_type'] = label
+        df['scraped_at'] = datetime.fromtimestamp(entry["fetched_at"]).isoformat()
+        
+        # Sort by date (most recent first)
+        df['Date'] = pd.to_datetime(df['Date'], errors='coerce')
+        df = df.sort_values('Date', ascending=False)
+        
+        logger.info(f"{label}: Scraped {len(df)} periods for {symbol}")
+        return df
     
-    def scrape_cash_flow(self, symbol: str, periods: int = 4) -> pd.DataFrame:
-        """Scrape Cash Flow Statement with historical data"""
+    def _scrape_statement(self, symbol: str, key: str) -> pd.DataFrame:
         try:
-            stock = yf.Ticker(symbol)
-            cash_flow = stock.cashflow
-            
-            if cash_flow.empty:
-                logger.warning(f"No cash flow data for {symbol}")
-                return pd.DataFrame()
-            
-            # Get quarterly data if available
-            try:
-                quarterly_cf = stock.quarterly_cashflow
-                if not quarterly_cf.empty:
-                    cash_flow = pd.concat([cash_flow, quarterly_cf], axis=1)
-                    cash_flow = cash_flow.loc[:, ~cash_flow.columns.duplicated()]
-            except:
-                pass
-            
-            # Transpose and add metadata
-            df = cash_flow.T.reset_index()
-            df.columns = ['Date'] + list(cash_flow.index)
-            df['symbol'] = symbol
-            df['statement_type'] = 'Cash Flow'
-            df['scraped_at'] = datetime.now().isoformat()
-            
-            # Sort by date (most recent first)
-            if 'Date' in df.columns:
-                df['Date'] = pd.to_datetime(df['Date'], errors='coerce')
-                df = df.sort_values('Date', ascending=False)
-            
-            logger.info(f"Cash Flow: Scraped {len(df)} periods for {symbol}")
-            return df
+            return self._build_statement(symbol, key, self.fetch_statements(symbol))
         except Exception as e:
-            logger.error(f"Cash Flow scraping failed for {symbol}: {e}")
+            logger.error(f"{STATEMENTS[key][0]} scraping failed for {symbol}: {e}")
             return pd.DataFrame()
     
+    def scrape_income_statement(self, symbol: str, periods: int = 4) -> pd.DataFrame:
+        """Scrape Income Statement with historical data"""
+        return self._scrape_statement(symbol, "income_statement")
+    
+    def scrape_balance_sheet(self, symbol: str, periods: int = 4) -> pd.DataFrame:
+        """Scrape Balance Sheet with historical data"""
+        return self._scrape_statement(symbol, "balance_sheet")
+    
+    def scrape_cash_flow(self, symbol: str, periods: int = 4) -> pd.DataFrame:
+        """Scrape Cash Flow Statement with historical data"""
+        return self._scrape_statement(symbol, "cash_flow")
+    
     def scrape_all_statements(self, symbol: str) -> Dict[str, pd.DataFrame]:
-        """Scrape all financial statements for a symbol"""
-        results = {
-            'income_statement': self.scrape_income_statement(symbol),
-            'balance_sheet': self.scrape_balance_sheet(symbol),
-            'cash_flow': self.scrape_cash_flow(symbol)
-        }
+        """Scrape all financial statements for a symbol from one (possibly cached) fetch"""
+        try:
+            entry = self.fetch_statements(symbol)
+        except Exception as e:
+            logger.error(f"Financial statements fetch failed for {symbol}: {e}")
+            return {key: pd.DataFrame() for key in STATEMENTS}
+        
+        results = {}
+        for key, (label, _, _) in STATEMENTS.items():
+            try:
+                results[key] = self._build_statement(symbol, key, entry)
+            except Exception as e:
+                logger.error(f"{label} scraping failed for {symbol}: {e}")
+                results[key] = pd.DataFrame()
         return results
     
     def scrape_multiple_stocks(self, symbols: List[str] = None, use_async: bool = True) -> Dict[str, pd.DataFrame]:
@@ -152,8 +189,8 @@ class FinancialStatementsScraper:
         all_cashflow = []
         
         if use_async and len(symbols) > 1:
-            # Concurrent scraping for better performance
-            with ThreadPoolExecutor(max_workers=min(len(symbols), 3)) as executor:
+            # Fetches are network-bound, so the pool is sized well past the core count
+            with ThreadPoolExecutor(max_workers=min(len(symbols), Config.FUNDAMENTALS_FETCH_WORKERS)) as executor:
                 future_to_symbol = {executor.submit(self.scrape_all_statements, symbol): symbol 
                                    for symbol in symbols}
                 
@@ -185,6 +222,8 @@ class FinancialStatementsScraper:
                 if not statements['cash_flow'].empty:
                     all_cashflow.append(statements['cash_flow'])
         
+        logger.info(f"Financial statements: {self.cache_hits} symbols from cache, "
+                    f"{self.remote_fetches} fetched remotely")
         return {
             'income_statement': pd.concat(all_income, ignore_index=True) if all_income else pd.DataFrame(),
             'balance_sheet': pd.concat(all_balance, ignore_index=True) if all_balance else pd.DataFrame(),
@@ -212,7 +251,8 @@ class FinancialStatementsScraper:
 
 
 if __name__ == "__main__":
-    scraper = FinancialStatementsScraper(symbols=["AAPL", "MSFT", "TSLA", "GOOG"])
+    scraper = FinancialStatementsScraper(symbols=["AAPL", "MSFT", "TSLA", "GOOG"],
+                                         refresh="--refresh" in sys.argv)
     statements = scraper.scrape_multiple_stocks()
     scraper.save_statements(statements)
 
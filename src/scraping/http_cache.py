@@ -0,0 +1,155 @@
+"""
+Conditional-GET HTTP cache for scraped pages
+SQLite table of url -> ETag / Last-Modified validators, body hash and the
+headline records parsed from that body. Within a source's TTL no request
+is made at all; after it, the request is conditional, and a 304 or a body
+with an unchanged hash reuses the stored records without parsing.
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import Counter
+from typing import Callable, List
+
+from src.scraping.http_sessions import raise_if_blocked
+from src.utils.config import Config
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class HttpCache:
+    """Thread-safe page cache keyed by URL with per-source TTL and LRU size limit"""
+
+    def __init__(self, path: str = Config.HTTP_CACHE_DB, max_mb: float = Config.HTTP_CACHE_MAX_MB):
+        self.path = path
+        self.max_bytes = int(max_mb * 1024 * 1024)
+        self.counts = Counter()
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        # One connection shared by the scraper's worker threads, serialized by _lock
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS http_cache ("
+            " url TEXT PRIMARY KEY,"
+            " etag TEXT,"
+            " last_modified TEXT,"
+            " body_hash TEXT NOT NULL,"
+            " records TEXT NOT NULL,"
+            " size INTEGER NOT NULL,"
+            " fetched_at REAL NOT NULL,"
+            " last_used REAL NOT NULL)"
+        )
+
+    @staticmethod
+    def ttl(source: str) -> float:
+        return Config.HTTP_CACHE_SOURCE_TTL.get(source, Config.HTTP_CACHE_TTL)
+
+    def _lookup(self, url: str):
+        with self._lock:
+            return self._conn.execute(
+                "SELECT etag, last_modified, body_hash, records, fetched_at FROM http_cache WHERE url = ?",
+                (url,),
+            ).fetchone()
+
+    def _mark_used(self, url: str):
+        """LRU touch only; the TTL keeps counting from the last validation"""
+        with self._lock, self._conn:
+            self._conn.execute("UPDATE http_cache SET last_used = ? WHERE url = ?", (time.time(), url))
+
+    def _touch(self, url: str, etag=None, last_modified=None):
+        """Record a successful revalidation: restarts the TTL and the LRU clock"""
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE http_cache SET fetched_at = ?, last_used = ?,"
+                " etag = COALESCE(?, etag), last_modified = COALESCE(?, last_modified) WHERE url = ?",
+                (now, now, etag, last_modified, url),
+            )
+
+    def _store(self, url: str, etag, last_modified, body_hash: str, records: List[dict]):
+        payload = json.dumps(records)
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO http_cache VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (url, etag, last_modified, body_hash, payload, len(payload), now, now),
+            )
+            self._evict()
+
+    def _evict(self):
+        """Drop least recently used pages until the cache is back under 90% of its limit"""
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM http_cache").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        target = int(self.max_bytes * 0.9)
+        evicted = 0
+        for url, size in self._conn.execute("SELECT url, size FROM http_cache ORDER BY last_used").fetchall():
+            if total <= target:
+                break
+            self._conn.execute("DELETE FROM http_cache WHERE url = ?", (url,))
+            total -= size
+            evicted += 1
+        self.counts["evicted"] += evicted
+        logger.info(f"HTTP cache: evicted {evicted} pages to stay under {self.max_bytes // (1024 * 1024)} MB")
+
+    def fetch(self, http, url: str, source: str, parse: Callable[[str], List[dict]]) -> List[dict]:
+        """
+        Return parse(page) records for url, parsing only when the page changed
+
+        Args:
+            http: SessionPool (or anything with get(url, headers=...))
+            url: Page URL
+            source: Source name, selects the TTL
+            parse: Turns page HTML into JSON-serializable records
+        """
+        entry = self._lookup(url)
+        headers = {}
+        if entry is not None:
+            etag, last_modified, body_hash, records, fetched_at = entry
+            if time.time() - fetched_at < self.ttl(source):
+                self.counts["fresh"] += 1
+                self._mark_used(url)
+                return json.loads(records)
+            if etag:
+                headers["If-None-Match"] = etag
+            if last_modified:
+                headers["If-Modified-Since"] = last_modified
+
+        response = http.get(url, headers=headers)
+        raise_if_blocked(response)
+        if response.status_code == 304 and entry is not None:
+            self.counts["not_modified"] += 1
+            self._touch(url)
+            return json.loads(entry[3])
+        if not response.ok:
+            # Error pages are parsed as before but never cached
+            self.counts["uncacheable"] += 1
+            return parse(response.text)
+
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        body_hash = hashlib.sha1(response.content).hexdigest()
+        if entry is not None and entry[2] == body_hash:
+            self.counts["unchanged"] += 1
+            self._touch(url, etag, last_modified)
+            return json.loads(entry[3])
+
+        self.counts["parsed"] += 1
+        records = parse(response.text)
+        self._store(url, etag, last_modified, body_hash, records)
+        return records
+
+    def stats(self) -> dict:
+        return dict(self.counts)
+
+    def log_stats(self):
+        if self.counts:
+            logger.info(f"HTTP cache: {self.stats()}")
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -4,11 +4,12 @@ Supports: Yahoo Finance, Reuters, MarketWatch, Bloomberg, Finviz, Seeking Alpha,
 With async/concurrent scraping capabilities
 """
 
-import requests
-from bs4 import BeautifulSoup
 import pandas as pd
-from datetime import datetime
+from datetime import datetime, timezone
+import os
+import sys
 import time
+from functools import partial
 from typing import List, Dict, Optional
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from selenium import webdriver
@@ -16,6 +17,17 @@ from selenium.webdriver.common.by import By
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
+from src.scraping.async_engine import AsyncScrapeEngine
+from src.scraping.http_cache import HttpCache
+from src.scraping.circuit_breaker import BreakerRegistry
+from src.scraping.http_sessions import SessionPool, SourceBlocked, raise_if_blocked
+from src.scraping.near_duplicates import assign_story_ids
+from src.scraping.parse_pool import ParsePool
+from src.scraping.seen_index import SeenIndex
+from src.scraping.news_sources import SOURCES, parse_source, to_utc_iso
+from src.scraping.news_store import NewsStore
+from src.utils.article_keys import article_keys
+from src.utils.config import Config
 from src.utils.helpers import save_csv
 from src.utils.logger import get_logger
 
@@ -32,244 +44,135 @@ HEADERS = {
 class MultiSourceScraper:
     """Scraper for multiple news sources"""
     
-    def __init__(self, symbols: List[str] = None):
+    def __init__(self, symbols: List[str] = None, pool_maxsize: int = Config.SCRAPER_POOL_MAXSIZE,
+                 use_cache: bool = True, parse_workers: int = Config.SCRAPER_PARSE_WORKERS):
         self.symbols = symbols or ["AAPL", "MSFT", "TSLA", "GOOG"]
         self.results = []
+        # Keep-alive sessions per host, shared by all worker threads
+        self.http = SessionPool(headers=HEADERS, pool_maxsize=pool_maxsize)
+        # Conditional GETs; unchanged pages reuse their stored records
+        self.http_cache = HttpCache() if use_cache else None
+        # Parsing runs in worker processes unless parse_workers == 0
+        self.parse_pool = ParsePool(parse_workers) if parse_workers != 0 else None
+        # Failing or blocking sources are skipped until a probe succeeds
+        self.breakers = BreakerRegistry()
     
-    def scrape_yahoo_finance(self, symbol: str) -> pd.DataFrame:
-        """Scrape news from Yahoo Finance"""
+    def _fetch_items(self, url: str, source: str, parse) -> List[Dict]:
+        """Headline/url items on a page; parse only runs when the page changed"""
+        if self.http_cache is None:
+            response = self.http.get(url)
+            raise_if_blocked(response)
+            return parse(response.text)
+        return self.http_cache.fetch(self.http, url, source, parse)
+    
+    @staticmethod
+    def _records(symbol: str, source: str, items: List[Dict]) -> List[Dict]:
+        # Naive UTC like the extracted publication times; scrape time stands in
+        # for pages that show none
+        now = to_utc_iso(datetime.now(timezone.utc))
+        return [
+            {
+                "symbol": symbol,
+                "source": source,
+                "headline": item["headline"],
+                "url": item["url"],
+                "published_at": item.get("published_at") or now,
+                "scraped_at": now
+            }
+            for item in items
+        ]
+    
+    def scrape_source(self, name: str, symbol: str) -> pd.DataFrame:
+        """Scrape one registered source (see news_sources.NEWS_SOURCES) for a symbol"""
+        breaker = self.breakers.get(name)
+        if not breaker.allow():
+            logger.info(f"{name}: circuit open, skipping {symbol}")
+            return pd.DataFrame()
+        
+        start = time.perf_counter()
         try:
-            url = f"https://finance.yahoo.com/quote/{symbol}/news"
-            response = requests.get(url, headers=HEADERS, timeout=15)
-            soup = BeautifulSoup(response.text, "html.parser")
+            source = SOURCES[name]
+            parse = partial(self.parse_pool.parse if self.parse_pool else parse_source, name)
+            items = self._fetch_items(source.page_url(symbol), name, parse)
+            breaker.record_success(time.perf_counter() - start)
+            data = self._records(symbol, name, items)
             
-            data = []
-            # Yahoo Finance news selectors
-            for item in soup.select("h3 a, h2 a"):
-                headline = item.get_text(strip=True)
-                link = item.get("href", "")
-                if headline and len(headline) > 10:
-                    data.append({
-                        "symbol": symbol,
-                        "source": "Yahoo Finance",
-                        "headline": headline,
-                        "url": f"https://finance.yahoo.com{link}" if link.startswith("/") else link,
-                        "published_at": datetime.now().isoformat(),
-                        "scraped_at": datetime.now().isoformat()
-                    })
-            
-            logger.info(f"Yahoo Finance: Scraped {len(data)} articles for {symbol}")
+            logger.info(f"{name}: Scraped {len(data)} articles for {symbol}")
             return pd.DataFrame(data)
         except Exception as e:
-            logger.error(f"Yahoo Finance scraping failed for {symbol}: {e}")
+            breaker.record_failure(time.perf_counter() - start, blocked=isinstance(e, SourceBlocked))
+            logger.error(f"{name} scraping failed for {symbol}: {e}")
             return pd.DataFrame()
     
+    def scrape_yahoo_finance(self, symbol: str) -> pd.DataFrame:
+        """Scrape news from Yahoo Finance"""
+        return self.scrape_source("Yahoo Finance", symbol)
+    
     def scrape_reuters(self, symbol: str) -> pd.DataFrame:
         """Scrape news from Reuters"""
-        try:
-            url = f"https://www.reuters.com/companies/{symbol}.OQ"
-            response = requests.get(url, headers=HEADERS, timeout=15)
-            soup = BeautifulSoup(response.text, "html.parser")
-            
-            data = []
-            for item in soup.select("a[data-testid='Link'], h3 a"):
-                headline = item.get_text(strip=True)
-                link = item.get("href", "")
-                if headline and len(headline) > 10:
-                    data.append({
-                        "symbol": symbol,
-                        "source": "Reuters",
-                        "headline": headline,
-                        "url": f"https://www.reuters.com{link}" if link.startswith("/") else link,
-                        "published_at": datetime.now().isoformat(),
-                        "scraped_at": datetime.now().isoformat()
-                    })
-            
-            logger.info(f"Reuters: Scraped {len(data)} articles for {symbol}")
-            return pd.DataFrame(data)
-        except Exception as e:
-            logger.error(f"Reuters scraping failed for {symbol}: {e}")
-            return pd.DataFrame()
+        return self.scrape_source("Reuters", symbol)
     
     def scrape_marketwatch(self, symbol: str) -> pd.DataFrame:
         """Scrape news from MarketWatch"""
-        try:
-            url = f"https://www.marketwatch.com/investing/stock/{symbol}"
-            response = requests.get(url, headers=HEADERS, timeout=15)
-            soup = BeautifulSoup(response.text, "html.parser")
-            
-            data = []
-            for item in soup.select("h3 a, .article__headline a"):
-                headline = item.get_text(strip=True)
-                link = item.get("href", "")
-                if headline and len(headline) > 10:
-                    data.append({
-                        "symbol": symbol,
-                        "source": "MarketWatch",
-                        "headline": headline,
-                        "url": f"https://www.marketwatch.com{link}" if link.startswith("/") else link,
-                        "published_at": datetime.now().isoformat(),
-                        "scraped_at": datetime.now().isoformat()
-                    })
-            
-            logger.info(f"MarketWatch: Scraped {len(data)} articles for {symbol}")
-            return pd.DataFrame(data)
-        except Exception as e:
-            logger.error(f"MarketWatch scraping failed for {symbol}: {e}")
-            return pd.DataFrame()
+        return self.scrape_source("MarketWatch", symbol)
     
     def scrape_finviz(self, symbol: str) -> pd.DataFrame:
         """Scrape news from Finviz"""
-        try:
-            url = f"https://finviz.com/quote.ashx?t={symbol}"
-            response = requests.get(url, headers=HEADERS, timeout=15)
-            soup = BeautifulSoup(response.text, "html.parser")
-            
-            data = []
-            # Finviz news table
-            news_table = soup.find("table", {"id": "news-table"})
-            if news_table:
-                for row in news_table.find_all("tr")[:20]:  # Limit to 20 articles
-                    cells = row.find_all("td")
-                    if len(cells) >= 2:
-                        headline = cells[1].get_text(strip=True)
-                        link = cells[1].find("a")
-                        url_link = link.get("href", "") if link else ""
-                        if headline:
-                            data.append({
-                                "symbol": symbol,
-                                "source": "Finviz",
-                                "headline": headline,
-                                "url": url_link,
-                                "published_at": datetime.now().isoformat(),
-                                "scraped_at": datetime.now().isoformat()
-                            })
-            
-            logger.info(f"Finviz: Scraped {len(data)} articles for {symbol}")
-            return pd.DataFrame(data)
-        except Exception as e:
-            logger.error(f"Finviz scraping failed for {symbol}: {e}")
-            return pd.DataFrame()
+        return self.scrape_source("Finviz", symbol)
     
     def scrape_seeking_alpha(self, symbol: str) -> pd.DataFrame:
         """Scrape news from Seeking Alpha"""
-        try:
-            url = f"https://seekingalpha.com/symbol/{symbol}/news"
-            response = requests.get(url, headers=HEADERS, timeout=15)
-            soup = BeautifulSoup(response.text, "html.parser")
-            
-            data = []
-            for item in soup.select("h3 a, .sa-c-article-title a"):
-                headline = item.get_text(strip=True)
-                link = item.get("href", "")
-                if headline and len(headline) > 10:
-                    data.append({
-                        "symbol": symbol,
-                        "source": "Seeking Alpha",
-                        "headline": headline,
-                        "url": f"https://seekingalpha.com{link}" if link.startswith("/") else link,
-                        "published_at": datetime.now().isoformat(),
-                        "scraped_at": datetime.now().isoformat()
-                    })
-            
-            logger.info(f"Seeking Alpha: Scraped {len(data)} articles for {symbol}")
-            return pd.DataFrame(data)
-        except Exception as e:
-            logger.error(f"Seeking Alpha scraping failed for {symbol}: {e}")
-            return pd.DataFrame()
+        return self.scrape_source("Seeking Alpha", symbol)
     
     def scrape_cnbc(self, symbol: str) -> pd.DataFrame:
         """Scrape news from CNBC"""
-        try:
-            url = f"https://www.cnbc.com/quotes/{symbol}"
-            response = requests.get(url, headers=HEADERS, timeout=15)
-            soup = BeautifulSoup(response.text, "html.parser")
-            
-            data = []
-            for item in soup.select("a.QuotePageNewsStory-headline, h3 a"):
-                headline = item.get_text(strip=True)
-                link = item.get("href", "")
-                if headline and len(headline) > 10:
-                    data.append({
-                        "symbol": symbol,
-                        "source": "CNBC",
-                        "headline": headline,
-                        "url": f"https://www.cnbc.com{link}" if link.startswith("/") else link,
-                        "published_at": datetime.now().isoformat(),
-                        "scraped_at": datetime.now().isoformat()
-                    })
-            
-            logger.info(f"CNBC: Scraped {len(data)} articles for {symbol}")
-            return pd.DataFrame(data)
-        except Exception as e:
-            logger.error(f"CNBC scraping failed for {symbol}: {e}")
-            return pd.DataFrame()
+        return self.scrape_source("CNBC", symbol)
     
     def scrape_benzinga(self, symbol: str) -> pd.DataFrame:
         """Scrape news from Benzinga"""
-        try:
-            url = f"https://www.benzinga.com/quote/{symbol}"
-            response = requests.get(url, headers=HEADERS, timeout=15)
-            soup = BeautifulSoup(response.text, "html.parser")
-            
-            data = []
-            for item in soup.select("h3 a, .article-title a"):
-                headline = item.get_text(strip=True)
-                link = item.get("href", "")
-                if headline and len(headline) > 10:
-                    data.append({
-                        "symbol": symbol,
-                        "source": "Benzinga",
-                        "headline": headline,
-                        "url": f"https://www.benzinga.com{link}" if link.startswith("/") else link,
-                        "published_at": datetime.now().isoformat(),
-                        "scraped_at": datetime.now().isoformat()
-                    })
-            
-            logger.info(f"Benzinga: Scraped {len(data)} articles for {symbol}")
-            return pd.DataFrame(data)
-        except Exception as e:
-            logger.error(f"Benzinga scraping failed for {symbol}: {e}")
-            return pd.DataFrame()
+        return self.scrape_source("Benzinga", symbol)
+    
+    def sources(self) -> List[str]:
+        """Names of all registered sources, for scrape_source()"""
+        return list(SOURCES)
+    
+    def source_domain(self, name: str) -> str:
+        return SOURCES[name].domain
+    
+    def source_health(self) -> pd.DataFrame:
+        """Per-source breaker state, success rate, blocks, skips and latency"""
+        return self.breakers.health()
     
     def scrape_all_sources(self, symbol: str, use_async: bool = True) -> pd.DataFrame:
         """Scrape from all available sources for a symbol with optional async support"""
         all_data = []
         
-        sources = [
-            self.scrape_yahoo_finance,
-            self.scrape_reuters,
-            self.scrape_marketwatch,
-            self.scrape_finviz,
-            self.scrape_seeking_alpha,
-            self.scrape_cnbc,
-            self.scrape_benzinga
-        ]
+        sources = self.sources()
         
         if use_async and len(sources) > 1:
             # Concurrent scraping for better performance
             with ThreadPoolExecutor(max_workers=min(len(sources), 5)) as executor:
-                future_to_source = {executor.submit(source_func, symbol): source_func for source_func in sources}
+                future_to_source = {executor.submit(self.scrape_source, name, symbol): name for name in sources}
                 
                 for future in as_completed(future_to_source):
-                    source_func = future_to_source[future]
+                    name = future_to_source[future]
                     try:
                         df = future.result(timeout=20)
                         if not df.empty:
                             all_data.append(df)
                     except Exception as e:
-                        logger.error(f"Error in {source_func.__name__}: {e}")
+                        logger.error(f"Error in {name}: {e}")
                         continue
         else:
             # Sequential scraping
-            for source_func in sources:
+            for name in sources:
                 try:
-                    df = source_func(symbol)
+                    df = self.scrape_source(name, symbol)
                     if not df.empty:
                         all_data.append(df)
                     time.sleep(1)  # Rate limiting
                 except Exception as e:
-                    logger.error(f"Error in {source_func.__name__}: {e}")
+                    logger.error(f"Error in {name}: {e}")
                     continue
         
         if all_data:
@@ -283,22 +186,10 @@ class MultiSourceScraper:
         symbols = symbols or self.symbols
         all_results = []
         
-        if use_async and len(symbols) > 1:
-            # Concurrent scraping for multiple stocks
-            with ThreadPoolExecutor(max_workers=min(len(symbols), 3)) as executor:
-                future_to_symbol = {executor.submit(self.scrape_all_sources, symbol, use_async=False): symbol 
-                                   for symbol in symbols}
-                
-                for future in as_completed(future_to_symbol):
-                    symbol = future_to_symbol[future]
-                    try:
-                        logger.info(f"Scraping news for {symbol}...")
-                        df = future.result(timeout=60)
-                        if not df.empty:
-                            all_results.append(df)
-                    except Exception as e:
-                        logger.error(f"Error scraping {symbol}: {e}")
-                        continue
+        if use_async:
+            # Fan out every (symbol, source) pair, rate limited per domain
+            logger.info(f"Scraping news for {', '.join(symbols)}...")
+            all_results = AsyncScrapeEngine(self).run(symbols)
         else:
             # Sequential scraping
             for symbol in symbols:
@@ -308,10 +199,19 @@ class MultiSourceScraper:
                     all_results.append(df)
                 time.sleep(2)  # Rate limiting between stocks
         
+        self.http.log_stats()
+        if self.http_cache is not None:
+            self.http_cache.log_stats()
+        if self.parse_pool is not None:
+            self.parse_pool.log_stats()
+            self.parse_pool.close()
+        self.breakers.log_health()
+        
         if all_results:
             final_df = pd.concat(all_results, ignore_index=True)
             final_df.drop_duplicates(subset=["headline", "symbol"], inplace=True)
-            return final_df
+            # Group syndicated near-duplicates so each story is scored and counted once
+            return assign_story_ids(final_df)
         return pd.DataFrame()
     
     def save_results(self, df: pd.DataFrame, filename: str = "multisource_news.csv"):
@@ -321,10 +221,69 @@ class MultiSourceScraper:
             logger.info(f"Saved {len(df)} articles to {filename}")
         else:
             logger.warning("No data to save")
+    
+    def save_to_store(self, df: pd.DataFrame, store: NewsStore = None) -> int:
+        """Add scraped articles to the time-partitioned NewsStore; returns the number of new rows"""
+        own_store = store is None
+        store = store or NewsStore()
+        try:
+            added = store.append(df)
+            print(f"🗂 {added} new articles added to {store.base_dir} ({len(df) - added} already stored)")
+            return added
+        finally:
+            if own_store:
+                store.close()
+    
+    def save_incremental(self, df: pd.DataFrame, filename: str = "multisource_news.csv",
+                         index: SeenIndex = None) -> int:
+        """
+        Append only articles not crawled before to data/raw/news/{filename}
+        
+        Articles are keyed by URL (normalized headline hash when there is no
+        URL) in a persisted SeenIndex, so the file keeps its history and
+        every appended row is new. Returns the number of new articles.
+        """
+        path = f"data/raw/news/{filename}"
+        own_index = index is None
+        index = index or SeenIndex()
+        try:
+            if len(index) == 0 and os.path.exists(path):
+                # First incremental run: everything already saved counts as seen
+                existing = pd.read_csv(path, usecols=lambda c: c in ("headline", "url"))
+                index.add(article_keys(existing).tolist())
+            
+            if df.empty:
+                logger.warning("No data to save")
+                return 0
+            keys = article_keys(df)
+            new_mask = index.filter_new(keys.tolist()) & ~keys.duplicated().values
+            new_df = df[new_mask]
+            
+            if not new_df.empty:
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                if os.path.exists(path):
+                    columns = pd.read_csv(path, nrows=0).columns.tolist()
+                    new_df.reindex(columns=columns).to_csv(path, mode="a", header=False, index=False)
+                else:
+                    new_df.to_csv(path, index=False)
+                index.add(keys[new_mask].tolist())
+            
+            logger.info(f"Incremental crawl: {len(new_df)} new of {len(df)} scraped articles "
+                        f"({index.bloom_negatives} Bloom negatives, {index.exact_checks} exact lookups)")
+            print(f"📰 {len(new_df)} new articles appended to {path} ({len(df) - len(new_df)} already seen)")
+            return len(new_df)
+        finally:
+            if own_index:
+                index.close()
 
 
 if __name__ == "__main__":
     scraper = MultiSourceScraper(symbols=["AAPL", "MSFT", "TSLA", "GOOG"])
     results = scraper.scrape_multiple_stocks()
-    scraper.save_results(results)
+    if "--incremental" in sys.argv:
+        scraper.save_incremental(results)
+    else:
+        scraper.save_results(results)
+    if "--store" in sys.argv:
+        scraper.save_to_store(results)
 
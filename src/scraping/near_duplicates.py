@@ -0,0 +1,177 @@
+"""
+Near-duplicate headline detection with MinHash + LSH banding
+Clusters syndicated copies of the same story (slightly different wording
+across Yahoo, Benzinga, CNBC, ...) and assigns each cluster a story_id
+"""
+import hashlib
+import re
+import zlib
+from collections import defaultdict
+from typing import List, Sequence
+
+import numpy as np
+import pandas as pd
+
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_NON_WORD = re.compile(r"[^a-z0-9 ]+")
+_SPACES = re.compile(r"\s+")
+
+
+def _normalize(headline: str) -> str:
+    text = _NON_WORD.sub(" ", str(headline).lower())
+    return _SPACES.sub(" ", text).strip()
+
+
+class HeadlineLSH:
+    """
+    MinHash signatures over character shingles, bucketed by LSH bands
+
+    With bands b and rows r per band, pairs above roughly (1/b)^(1/r)
+    Jaccard similarity become candidates; candidates are then confirmed
+    against the exact shingle Jaccard before being merged into a story.
+    """
+
+    def __init__(self, num_perm: int = 64, bands: int = 16, threshold: float = 0.6,
+                 shingle_size: int = 4, seed: int = 7):
+        if num_perm % bands:
+            raise ValueError("num_perm must be divisible by bands")
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.threshold = threshold
+        self.shingle_size = shingle_size
+        rng = np.random.default_rng(seed)
+        self._a = rng.integers(1, _MERSENNE_PRIME, size=num_perm, dtype=np.uint64)
+        self._b = rng.integers(0, _MERSENNE_PRIME, size=num_perm, dtype=np.uint64)
+
+    def shingles(self, headline: str) -> set:
+        text = _normalize(headline)
+        k = self.shingle_size
+        if len(text) <= k:
+            return {text}
+        return {text[i:i + k] for i in range(len(text) - k + 1)}
+
+    def signature(self, shingles: set) -> np.ndarray:
+        hashes = np.fromiter((zlib.crc32(s.encode("utf-8")) for s in shingles), dtype=np.uint64)
+        # Universal hashing (a*x + b) mod p for every permutation at once
+        permuted = (np.outer(self._a, hashes) + self._b[:, None]) % _MERSENNE_PRIME
+        return permuted.min(axis=1)
+
+    def cluster(self, headlines: Sequence[str]) -> List[int]:
+        """Return a cluster index per headline; near-duplicates share an index"""
+        shingle_sets = [self.shingles(h) for h in headlines]
+        parent = list(range(len(headlines)))
+
+        def find(i):
+            while parent[i] != i:
+                parent[i] = parent[parent[i]]
+                i = parent[i]
+            return i
+
+        buckets = defaultdict(list)
+        for i, shingles in enumerate(shingle_sets):
+            signature = self.signature(shingles)
+            for band in range(self.bands):
+                band_key = (band, signature[band * self.rows:(band + 1) * self.rows].tobytes())
+                matched = False
+                for j in buckets[band_key]:
+                    root_i, root_j = find(i), find(j)
+                    if root_i == root_j:
+                        matched = True
+                        continue
+                    # Verify against the story's representative (its root) so
+                    # clusters can't drift through chains of pairwise matches
+                    rep = shingle_sets[root_j]
+                    union = len(shingles | rep)
+                    if union and len(shingles & rep) / union >= self.threshold:
+                        parent[root_i] = root_j
+                        matched = True
+                # One member per story per bucket keeps bucket scans short
+                if not matched:
+                    buckets[band_key].append(i)
+
+        return [find(i) for i in range(len(headlines))]
+
+
+class StoryIndex:
+    """
+    Incremental story clustering across batches
+
+    Keeps the LSH band buckets and each story's representative shingles
+    between add() calls, so a syndicated copy arriving in a later batch
+    (another source's page) joins the story first seen in an earlier one.
+    Story ids are hashes of the representative headline, as in
+    assign_story_ids.
+    """
+
+    def __init__(self, lsh: HeadlineLSH = None):
+        self.lsh = lsh or HeadlineLSH()
+        self._buckets = defaultdict(list)
+        self._representatives = []
+        self._story_ids = []
+
+    def __len__(self) -> int:
+        return len(self._story_ids)
+
+    def _band_keys(self, shingles: set) -> List[tuple]:
+        signature = self.lsh.signature(shingles)
+        rows = self.lsh.rows
+        return [(band, signature[band * rows:(band + 1) * rows].tobytes()) for band in range(self.lsh.bands)]
+
+    def add(self, headlines: Sequence[str]) -> List[str]:
+        """Return a story_id per headline, matching stories from earlier batches"""
+        story_ids = []
+        for headline in headlines:
+            shingles = self.lsh.shingles(headline)
+            band_keys = self._band_keys(shingles)
+            story = None
+            for band_key in band_keys:
+                for candidate in self._buckets.get(band_key, ()):
+                    rep = self._representatives[candidate]
+                    union = len(shingles | rep)
+                    if union and len(shingles & rep) / union >= self.lsh.threshold:
+                        story = candidate
+                        break
+                if story is not None:
+                    break
+            if story is None:
+                story = len(self._story_ids)
+                self._representatives.append(shingles)
+                self._story_ids.append(hashlib.sha1(_normalize(headline).encode("utf-8")).hexdigest()[:16])
+            for band_key in band_keys:
+                bucket = self._buckets[band_key]
+                # One entry per story per bucket keeps bucket scans short
+                if story not in bucket:
+                    bucket.append(story)
+            story_ids.append(self._story_ids[story])
+        return story_ids
+
+
+def assign_story_ids(df: pd.DataFrame, lsh: HeadlineLSH = None) -> pd.DataFrame:
+    """
+    Add a story_id column grouping near-duplicate headlines
+
+    The id is a hash of the cluster's first headline, so a story keeps
+    its id as long as that representative headline is unchanged.
+    """
+    if df.empty or "headline" not in df.columns:
+        return df
+    lsh = lsh or HeadlineLSH()
+    headlines = df["headline"].astype(str).tolist()
+    clusters = lsh.cluster(headlines)
+
+    first_headline = {}
+    for cluster, headline in zip(clusters, headlines):
+        first_headline.setdefault(cluster, headline)
+    story_ids = [
+        hashlib.sha1(_normalize(first_headline[c]).encode("utf-8")).hexdigest()[:16] for c in clusters
+    ]
+
+    df = df.copy()
+    df["story_id"] = story_ids
+    logger.info(f"Near-duplicate detection: {len(df)} headlines -> {len(first_headline)} stories")
+    return df
@@ -0,0 +1,224 @@
+"""
+Time-partitioned news store
+Articles are written to symbol=SYM/date=YYYY-MM-DD.csv partitions by their
+publication date (naive UTC) and keyed by a SHA-1 hash of the article URL
+(normalized headline when there is none). A SQLite index of
+(url_hash, symbol) keys makes re-appending a crawl idempotent, and range
+queries open only the partitions whose symbol and date fall in the window,
+so "AAPL over the last 6 hours" reads one or two small files instead of
+the full news history.
+"""
+import hashlib
+import os
+import sqlite3
+import sys
+from typing import List, Optional
+
+import pandas as pd
+
+from src.utils.article_keys import article_keys
+from src.utils.config import Config
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# SQLite's default host-parameter limit is 999
+_QUERY_BATCH = 900
+
+
+def url_hashes(df: pd.DataFrame) -> pd.Series:
+    """Primary key per article: SHA-1 of its URL, or of the normalized headline hash"""
+    return article_keys(df).map(lambda key: hashlib.sha1(key.encode("utf-8")).hexdigest())
+
+
+# pandas >= 2 infers one format from the first value and turns other ISO
+# variants (fractional seconds, offsets, date-only) into NaT unless told the
+# values are ISO 8601; pandas 1.x has no "ISO8601" format but parses each
+# value on its own
+_ISO_FORMAT = {"format": "ISO8601"} if int(pd.__version__.split(".")[0]) >= 2 else {}
+
+
+def to_utc(values) -> pd.Series:
+    """Timestamps as naive UTC; naive inputs are taken as UTC already"""
+    return pd.to_datetime(values, errors="coerce", utc=True, **_ISO_FORMAT).dt.tz_localize(None)
+
+
+def _utc_timestamp(value) -> Optional[pd.Timestamp]:
+    if value is None:
+        return None
+    ts = pd.Timestamp(value)
+    return ts.tz_convert("UTC").tz_localize(None) if ts.tzinfo is not None else ts
+
+
+class NewsStore:
+    """News articles partitioned by symbol and publication date"""
+
+    INDEX_FILE = "_keys.sqlite"
+
+    def __init__(self, base_dir: str = Config.NEWS_STORE_DIR):
+        self.base_dir = base_dir
+        os.makedirs(base_dir, exist_ok=True)
+        self._conn = sqlite3.connect(os.path.join(base_dir, self.INDEX_FILE))
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS articles ("
+            " url_hash TEXT NOT NULL,"
+            " symbol TEXT NOT NULL,"
+            " date TEXT NOT NULL,"
+            " PRIMARY KEY (url_hash, symbol))"
+        )
+        if len(self) == 0 and self._symbol_dirs():
+            self._rebuild_index()
+
+    def __len__(self) -> int:
+        return self._conn.execute("SELECT COUNT(*) FROM articles").fetchone()[0]
+
+    def _partition_path(self, symbol: str, date) -> str:
+        return os.path.join(self.base_dir, f"symbol={symbol}", f"date={date}.csv")
+
+    def _symbol_dirs(self) -> List[str]:
+        return sorted(d for d in os.listdir(self.base_dir) if d.startswith("symbol="))
+
+    def _rebuild_index(self):
+        """Re-key existing partitions, e.g. after the index file was deleted"""
+        rows = []
+        for path in self.partitions():
+            symbol = os.path.basename(os.path.dirname(path))[len("symbol="):]
+            date = os.path.basename(path)[len("date="):-len(".csv")]
+            hashes = pd.read_csv(path, usecols=["url_hash"])["url_hash"]
+            rows.extend((h, symbol, date) for h in hashes)
+        with self._conn:
+            self._conn.executemany("INSERT OR IGNORE INTO articles VALUES (?, ?, ?)", rows)
+        logger.info(f"News store: rebuilt key index with {len(self)} articles")
+
+    def _existing(self, df: pd.DataFrame) -> pd.Series:
+        """Mask of rows whose (url_hash, symbol) is already stored"""
+        hashes = df["url_hash"].unique().tolist()
+        stored = set()
+        for i in range(0, len(hashes), _QUERY_BATCH):
+            batch = hashes[i:i + _QUERY_BATCH]
+            rows = self._conn.execute(
+                f"SELECT url_hash, symbol FROM articles WHERE url_hash IN ({','.join('?' * len(batch))})", batch
+            )
+            stored.update(rows)
+        return pd.Series([key in stored for key in zip(df["url_hash"], df["symbol"])], index=df.index)
+
+    def append(self, df: pd.DataFrame) -> int:
+        """
+        Write articles not stored yet to their symbol/date partitions
+
+        Rows without a parseable published_at fall back to scraped_at. An
+        article already stored for a symbol keeps its first partition even if
+        a later crawl reports another time. Returns the number of new rows.
+        """
+        if df.empty:
+            return 0
+
+        df = df.copy()
+        df["url_hash"] = url_hashes(df)
+        published = to_utc(df["published_at"]) if "published_at" in df.columns else pd.Series(pd.NaT, index=df.index)
+        if "scraped_at" in df.columns:
+            published = published.fillna(to_utc(df["scraped_at"]))
+        df["published_at"] = published
+        df = df.dropna(subset=["published_at"]).drop_duplicates(["url_hash", "symbol"])
+        df = df[~self._existing(df)]
+        if df.empty:
+            return 0
+
+        columns = ["url_hash"] + [c for c in df.columns if c != "url_hash"]
+        dates = df["published_at"].dt.date
+        keys = []
+        for (symbol, date), part in df.groupby([df["symbol"], dates]):
+            path = self._partition_path(symbol, date)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            if os.path.exists(path):
+                header = pd.read_csv(path, nrows=0).columns.tolist()
+                part.reindex(columns=header).to_csv(path, mode="a", header=False, index=False)
+            else:
+                part[columns].to_csv(path, index=False)
+            keys.extend((h, symbol, str(date)) for h in part["url_hash"])
+
+        # Keys go in after the rows are on disk; a crash in between leaves at
+        # most duplicate rows, which query() drops
+        with self._conn:
+            self._conn.executemany("INSERT OR IGNORE INTO articles VALUES (?, ?, ?)", keys)
+        logger.info(f"News store: appended {len(df)} articles to {df.groupby(['symbol', dates]).ngroups} partitions")
+        return len(df)
+
+    def partitions(self, symbols: List[str] = None, start=None, end=None) -> List[str]:
+        """Partition files covering the symbols and [start, end] publication window"""
+        start, end = _utc_timestamp(start), _utc_timestamp(end)
+        if symbols:
+            symbol_dirs = [f"symbol={symbol}" for symbol in symbols]
+        else:
+            symbol_dirs = self._symbol_dirs()
+
+        paths = []
+        for symbol_dir in symbol_dirs:
+            full_dir = os.path.join(self.base_dir, symbol_dir)
+            if not os.path.isdir(full_dir):
+                continue
+            if start is not None and end is not None:
+                # Bounded window: build the day paths directly, no listing
+                days = pd.date_range(start.normalize(), end.normalize(), freq="D")
+                candidates = [os.path.join(full_dir, f"date={day.date()}.csv") for day in days]
+                paths.extend(p for p in candidates if os.path.exists(p))
+                continue
+            # ISO dates compare correctly as strings
+            low = str(start.date()) if start is not None else ""
+            high = str(end.date()) if end is not None else "9999-12-31"
+            for filename in sorted(os.listdir(full_dir)):
+                if filename.startswith("date=") and filename.endswith(".csv"):
+                    if low <= filename[len("date="):-len(".csv")] <= high:
+                        paths.append(os.path.join(full_dir, filename))
+        return paths
+
+    def query(self, symbols: List[str] = None, start=None, end=None) -> pd.DataFrame:
+        """
+        Articles for symbols published in [start, end], oldest first
+
+        Args:
+            symbols: Symbols to read (None = all)
+            start: Window start, anything pd.Timestamp accepts; naive means UTC
+            end: Window end (None = open-ended)
+        """
+        paths = self.partitions(symbols, start, end)
+        if not paths:
+            return pd.DataFrame()
+
+        df = pd.concat([pd.read_csv(path) for path in paths], ignore_index=True)
+        df["published_at"] = to_utc(df["published_at"])
+        start, end = _utc_timestamp(start), _utc_timestamp(end)
+        if start is not None:
+            df = df[df["published_at"] >= start]
+        if end is not None:
+            df = df[df["published_at"] <= end]
+        df = df.drop_duplicates(["url_hash", "symbol"]).sort_values("published_at", kind="stable")
+        logger.info(f"News store: {len(df)} articles from {len(paths)} partitions")
+        return df.reset_index(drop=True)
+
+    def recent(self, symbols: List[str] = None, hours: float = 6) -> pd.DataFrame:
+        """Articles published in the last `hours` hours"""
+        now = pd.Timestamp.now(tz="UTC").tz_localize(None)
+        return self.query(symbols, start=now - pd.Timedelta(hours=hours), end=now)
+
+    def import_csv(self, path: str, chunksize: int = 50_000) -> int:
+        """Backfill the store from a flat news CSV such as multisource_news.csv"""
+        added = 0
+        for chunk in pd.read_csv(path, chunksize=chunksize):
+            added += self.append(chunk)
+        print(f"📦 Imported {added} articles from {path} into {self.base_dir}")
+        return added
+
+    def close(self):
+        self._conn.close()
+
+
+if __name__ == "__main__":
+    store = NewsStore()
+    if "--import" in sys.argv:
+        store.import_csv("data/raw/news/multisource_news.csv")
+    recent = store.recent(hours=6)
+    print(f"🗞 {len(recent)} articles published in the last 6 hours across {len(store)} stored")
+    if not recent.empty:
+        print(recent.groupby("symbol").size().to_string())
+    store.close()
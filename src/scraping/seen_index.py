@@ -0,0 +1,150 @@
+"""
+Persisted index of already-crawled articles
+A Bloom filter answers "definitely new" for most keys without touching
+disk; keys it might have seen are confirmed against an exact SQLite
+store, so false positives never drop a new article.
+"""
+import hashlib
+import json
+import math
+import os
+import sqlite3
+from typing import Iterable, List
+
+import numpy as np
+
+from src.utils.config import Config
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# SQLite's default host-parameter limit is 999
+_QUERY_BATCH = 900
+
+
+class BloomFilter:
+    """Numpy bit array with k positions per key from double hashing"""
+
+    def __init__(self, capacity: int, error_rate: float):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.n_bits = max(int(-capacity * math.log(error_rate) / math.log(2) ** 2), 8)
+        self.n_hashes = max(int(round(self.n_bits / capacity * math.log(2))), 1)
+        self.bits = np.zeros((self.n_bits + 7) // 8, dtype=np.uint8)
+        self.count = 0
+
+    def _positions(self, keys: List[str]) -> np.ndarray:
+        digests = [hashlib.blake2b(k.encode("utf-8"), digest_size=16).digest() for k in keys]
+        pairs = np.frombuffer(b"".join(digests), dtype=np.uint64).reshape(-1, 2)
+        i = np.arange(self.n_hashes, dtype=np.uint64)
+        # g_i(x) = h1(x) + i * h2(x), wrapping in uint64 before the modulo
+        return (pairs[:, :1] + i * pairs[:, 1:]) % np.uint64(self.n_bits)
+
+    def add(self, keys: List[str]):
+        if not keys:
+            return
+        positions = self._positions(keys).ravel()
+        np.bitwise_or.at(self.bits, positions // 8, (1 << (positions % 8)).astype(np.uint8))
+        self.count += len(keys)
+
+    def might_contain(self, keys: List[str]) -> np.ndarray:
+        if not keys:
+            return np.zeros(0, dtype=bool)
+        positions = self._positions(keys)
+        hits = (self.bits[positions // 8] >> (positions % 8).astype(np.uint8)) & 1
+        return hits.all(axis=1)
+
+
+class SeenIndex:
+    """Bloom filter + exact SQLite store of seen article keys"""
+
+    def __init__(self, base_dir: str = Config.SEEN_INDEX_DIR, capacity: int = Config.SEEN_INDEX_CAPACITY,
+                 error_rate: float = Config.SEEN_INDEX_ERROR_RATE):
+        self.base_dir = base_dir
+        self.error_rate = error_rate
+        os.makedirs(base_dir, exist_ok=True)
+        self._bits_path = os.path.join(base_dir, "bloom.npy")
+        self._meta_path = os.path.join(base_dir, "bloom.json")
+        self._conn = sqlite3.connect(os.path.join(base_dir, "seen.sqlite"))
+        self._conn.execute("CREATE TABLE IF NOT EXISTS seen (key TEXT PRIMARY KEY)")
+        self.bloom = self._load_bloom(capacity)
+        self.bloom_negatives = 0
+        self.exact_checks = 0
+
+    def _load_bloom(self, capacity: int) -> BloomFilter:
+        stored = len(self)
+        if os.path.exists(self._meta_path) and os.path.exists(self._bits_path):
+            with open(self._meta_path) as f:
+                meta = json.load(f)
+            # A filter missing keys would report seen articles as new; only
+            # trust it if it covers exactly the keys in the exact store
+            if meta["count"] == stored:
+                bloom = BloomFilter(meta["capacity"], meta["error_rate"])
+                bloom.bits = np.load(self._bits_path)
+                bloom.count = stored
+                return bloom
+            logger.warning("Seen index: Bloom filter out of sync with the exact store, rebuilding")
+            capacity = max(capacity, meta["capacity"])
+        return self._rebuild(max(capacity, 2 * stored))
+
+    def _rebuild(self, capacity: int) -> BloomFilter:
+        bloom = BloomFilter(capacity, self.error_rate)
+        self._add_to_bloom(bloom, self._iter_exact())
+        bloom.count = len(self)
+        return bloom
+
+    def _iter_exact(self):
+        for (key,) in self._conn.execute("SELECT key FROM seen"):
+            yield key
+
+    @staticmethod
+    def _add_to_bloom(bloom: BloomFilter, keys: Iterable[str], batch: int = 50_000):
+        pending = []
+        for key in keys:
+            pending.append(key)
+            if len(pending) >= batch:
+                bloom.add(pending)
+                pending = []
+        bloom.add(pending)
+
+    def __len__(self) -> int:
+        return self._conn.execute("SELECT COUNT(*) FROM seen").fetchone()[0]
+
+    def filter_new(self, keys: List[str]) -> np.ndarray:
+        """Boolean mask of keys not in the index"""
+        keys = list(keys)
+        maybe_seen = self.bloom.might_contain(keys)
+        self.bloom_negatives += int((~maybe_seen).sum())
+
+        candidates = list({k for k, maybe in zip(keys, maybe_seen) if maybe})
+        self.exact_checks += len(candidates)
+        seen = set()
+        for i in range(0, len(candidates), _QUERY_BATCH):
+            batch = candidates[i:i + _QUERY_BATCH]
+            rows = self._conn.execute(
+                f"SELECT key FROM seen WHERE key IN ({','.join('?' * len(batch))})", batch
+            )
+            seen.update(key for (key,) in rows)
+        return np.array([k not in seen for k in keys], dtype=bool)
+
+    def add(self, keys: List[str]):
+        """Record keys as seen and persist the filter"""
+        keys = list(dict.fromkeys(keys))
+        with self._conn:
+            self._conn.executemany("INSERT OR IGNORE INTO seen VALUES (?)", [(k,) for k in keys])
+        self.bloom.add(keys)
+        self.bloom.count = len(self)
+        if self.bloom.count > self.bloom.capacity:
+            # Past capacity the false-positive rate climbs; rebuild at double size
+            logger.info(f"Seen index: growing Bloom filter beyond {self.bloom.capacity} keys")
+            self.bloom = self._rebuild(self.bloom.capacity * 2)
+        self.save()
+
+    def save(self):
+        np.save(self._bits_path, self.bloom.bits)
+        with open(self._meta_path, "w") as f:
+            json.dump({"capacity": self.bloom.capacity, "error_rate": self.bloom.error_rate,
+                       "count": self.bloom.count}, f)
+
+    def close(self):
+        self._conn.close()
@@ -0,0 +1,196 @@
+"""
+Trainable Linear Sentiment Engine
+Hashed unigram+bigram features feeding a linear classifier trained on
+labeled headlines. Scoring is one sparse matrix product per batch, and
+the artifact stores only the non-zero hashed weights.
+"""
+import hashlib
+import os
+import sys
+import time
+from typing import Sequence
+
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+from sklearn.feature_extraction.text import HashingVectorizer
+from sklearn.linear_model import SGDClassifier
+from sklearn.metrics import accuracy_score, f1_score
+from sklearn.model_selection import train_test_split
+
+from src.utils.config import Config
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Artifact format; the cache version also includes a digest of the weights
+LINEAR_VERSION = "linear-1"
+CLASSES = np.array(["negative", "neutral", "positive"])
+_NUMERIC_LABELS = {-1: "negative", 0: "neutral", 1: "positive"}
+
+
+def _unigrams_and_bigrams(cleaned: str) -> list:
+    # Input is already normalized by clean_texts, so a whitespace split is
+    # enough and much cheaper than the regex tokenizer + ngram builder
+    tokens = cleaned.split()
+    return tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+
+
+def _vectorizer(n_features: int) -> HashingVectorizer:
+    return HashingVectorizer(
+        n_features=n_features, analyzer=_unigrams_and_bigrams, alternate_sign=False, norm="l2",
+    )
+
+
+class LinearSentimentModel:
+    """Hashed-feature linear classifier scoring P(positive) - P(negative)"""
+
+    def __init__(self, weights: sp.csc_matrix, intercept: np.ndarray, n_features: int, version: str):
+        self.weights = weights
+        self.intercept = intercept
+        self.n_features = n_features
+        self.version = version
+        self.vectorizer = _vectorizer(n_features)
+
+    @classmethod
+    def train(cls, cleaned: Sequence[str], labels: Sequence[str], n_features: int = 2 ** 20,
+              alpha: float = 1e-5, epochs: int = 10, random_state: int = 42) -> "LinearSentimentModel":
+        """Fit on cleaned headlines labeled negative/neutral/positive"""
+        X = _vectorizer(n_features).transform(cleaned)
+        clf = SGDClassifier(loss="log_loss", alpha=alpha, max_iter=epochs, tol=None,
+                            random_state=random_state)
+        clf.fit(X, labels)
+        missing = set(CLASSES) - set(clf.classes_)
+        if missing:
+            raise ValueError(f"Training labels are missing classes: {', '.join(sorted(missing))}")
+
+        # classes_ are sorted, which matches CLASSES; store weights as features x classes
+        weights = sp.csc_matrix(clf.coef_.T.astype(np.float32))
+        intercept = clf.intercept_.astype(np.float32)
+        digest = hashlib.sha1(weights.data.tobytes() + weights.indices.tobytes() + intercept.tobytes())
+        return cls(weights, intercept, n_features, f"{LINEAR_VERSION}.{digest.hexdigest()[:12]}")
+
+    def score(self, cleaned: Sequence[str]) -> np.ndarray:
+        """Polarity in [-1, 1] for each cleaned headline"""
+        X = self.vectorizer.transform(cleaned)
+        logits = (X @ self.weights).toarray() + self.intercept
+        # One-vs-rest probabilities, normalized as in SGDClassifier.predict_proba
+        proba = 1.0 / (1.0 + np.exp(-logits))
+        proba /= proba.sum(axis=1, keepdims=True)
+        return (proba[:, 2] - proba[:, 0]).astype(float)
+
+    def save(self, path: str = Config.SENTIMENT_LINEAR_MODEL):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        w = self.weights.tocoo()
+        # np.savez appends .npz; write to the exact configured path instead
+        with open(path, "wb") as f:
+            np.savez_compressed(
+                f, rows=w.row.astype(np.int32), cols=w.col.astype(np.int8), data=w.data,
+                intercept=self.intercept, n_features=self.n_features, version=self.version,
+            )
+        logger.info(f"Saved linear sentiment model {self.version} ({w.nnz} weights) to {path}")
+
+    @classmethod
+    def load(cls, path: str = Config.SENTIMENT_LINEAR_MODEL) -> "LinearSentimentModel":
+        if not os.path.exists(path):
+            raise FileNotFoundError(
+                f"Linear sentiment model not found at {path}. "
+                "Train it with: python -m src.sentiment.linear_engine --train"
+            )
+        with np.load(path) as artifact:
+            n_features = int(artifact["n_features"])
+            weights = sp.csc_matrix(
+                (artifact["data"], (artifact["rows"], artifact["cols"])), shape=(n_features, len(CLASSES))
+            )
+            return cls(weights, artifact["intercept"], n_features, str(artifact["version"]))
+
+
+_model = None
+
+
+def get_linear_model() -> LinearSentimentModel:
+    """Module-wide model so the artifact is read once per process"""
+    global _model
+    if _model is None:
+        _model = LinearSentimentModel.load()
+    return _model
+
+
+def _labels(values: pd.Series) -> pd.Series:
+    if pd.api.types.is_numeric_dtype(values):
+        return np.sign(values).map(_NUMERIC_LABELS)
+    return values.astype(str).str.strip().str.lower()
+
+
+def train_linear_model(labels_file: str = None, test_size: float = 0.2) -> LinearSentimentModel:
+    """
+    Train and save the linear engine from labeled headlines
+
+    Args:
+        labels_file: CSV with a headline column and a label (or sentiment) column
+            holding negative/neutral/positive or -1/0/1. Defaults to
+            Config.SENTIMENT_LABELS_FILE, falling back to the labels already in
+            the sentiment output (which distills the engine that produced them).
+        test_size: Fraction held out for the accuracy report
+    """
+    from src.sentiment.preprocess_text import clean_texts
+    from src.sentiment.sentiment_model import SENTIMENT_OUTPUT, categorize_sentiment
+
+    if labels_file is None:
+        labels_file = Config.SENTIMENT_LABELS_FILE
+        if not os.path.exists(labels_file):
+            logger.warning(f"{labels_file} not found; training on labels in {SENTIMENT_OUTPUT}")
+            labels_file = SENTIMENT_OUTPUT
+
+    df = pd.read_csv(labels_file)
+    label_column = next((c for c in ("label", "sentiment") if c in df.columns), None)
+    if "headline" not in df.columns or label_column is None:
+        raise ValueError(f"{labels_file} needs 'headline' and 'label' (or 'sentiment') columns")
+
+    df = df.assign(label=_labels(df[label_column])).dropna(subset=["headline", "label"])
+    df = df[df["label"].isin(CLASSES)]
+    cleaned = clean_texts(df["headline"]).tolist()
+    labels = df["label"].tolist()
+
+    train_x, test_x, train_y, test_y = train_test_split(
+        cleaned, labels, test_size=test_size, random_state=42, stratify=labels
+    )
+    model = LinearSentimentModel.train(train_x, train_y)
+    predicted = [categorize_sentiment(score) for score in model.score(test_x)]
+    logger.info(
+        f"Linear sentiment holdout: accuracy={accuracy_score(test_y, predicted):.3f} "
+        f"macro_f1={f1_score(test_y, predicted, average='macro'):.3f} on {len(test_y)} headlines"
+    )
+
+    # Refit on everything before saving
+    model = LinearSentimentModel.train(cleaned, labels)
+    model.save()
+    return model
+
+
+def benchmark(n_headlines: int = 100_000):
+    """Single-core scoring throughput of the trained linear engine"""
+    from src.sentiment.preprocess_text import clean_texts
+
+    samples = [
+        "Apple shares surge after record quarterly earnings beat expectations",
+        "Tesla stock falls as deliveries miss analyst estimates",
+        "Microsoft announces new cloud partnership with major bank",
+        "Regulators open probe into chipmaker over export violations",
+        "Nvidia did not beat estimates despite strong demand",
+        "Bank warns of slowdown as loan losses rise",
+    ]
+    cleaned = clean_texts([samples[i % len(samples)] for i in range(n_headlines)]).tolist()
+    model = get_linear_model()
+
+    start = time.perf_counter()
+    model.score(cleaned)
+    elapsed = time.perf_counter() - start
+    print(f"Linear engine {model.version}: {n_headlines / elapsed:10.0f} headlines/s")
+
+
+if __name__ == "__main__":
+    if "--train" in sys.argv:
+        train_linear_model()
+    if "--benchmark" in sys.argv:
+        benchmark()
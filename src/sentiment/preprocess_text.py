@@ -1,14 +1,103 @@
-import nltk
-from nltk.tokenize import word_tokenize
+import re
+import sys
+import time
+
+import pandas as pd
+
+# Approximates NLTK's Treebank word_tokenize for headline-length text:
+# splits off contractions and punctuation, keeps numbers, acronyms and
+# hyphenated words whole. Applied to already-lowercased text.
+_TOKEN = re.compile(r"""
+      [a-z]+(?=n't\b)                   # "do" of "don't"
+    | n't\b                             # negation clitic
+    | '(?:s|re|ve|ll|d|m)\b             # other clitics
+    | \d+(?:[.,]\d+)*[a-z]*             # 5.2bn, 1,000, 3m
+    | (?:[a-z]\.){2,}                   # u.s.
+    | \w+(?:[-/]\w+)*                   # words, ai-driven, y/y
+    | \.\.\. | `` | ''                  # ellipsis, Treebank-style quotes
+    | [^\s\w]                           # any other punctuation mark
+""", re.VERBOSE)
+
+# Treebank turns an opening " into `` and any other " into ''
+_OPEN_QUOTE = re.compile(r'(^|[\s(\[{<])"')
+_CLOSE_QUOTE = re.compile(r'"')
+
+_nltk_ready = False
+
+
+def ensure_nltk():
+    """Check for (and download if missing) the NLTK tokenizers, once per process"""
+    global _nltk_ready
+    if _nltk_ready:
+        return
+    import nltk
+
+    # Ensure necessary NLTK tokenizers are available
+    for resource in ["punkt", "punkt_tab"]:
+        try:
+            nltk.data.find(f"tokenizers/{resource}")
+        except LookupError:
+            print(f"⚠ '{resource}' not found. Downloading now...")
+            nltk.download(resource)
+    _nltk_ready = True
 
-# Ensure necessary NLTK tokenizers are available
-for resource in ["punkt", "punkt_tab"]:
-    try:
-        nltk.data.find(f"tokenizers/{resource}")
-    except LookupError:
-        print(f"⚠ '{resource}' not found. Downloading now...")
-        nltk.download(resource)
 
 def clean_text(text):
+    """Lowercase and re-join NLTK word tokens (initializes NLTK on first call)"""
+    ensure_nltk()
+    from nltk.tokenize import word_tokenize
     tokens = word_tokenize(text.lower())
     return " ".join(tokens)
+
+
+def clean_text_fast(text):
+    """Regex equivalent of clean_text for a single headline; no NLTK needed"""
+    text = _CLOSE_QUOTE.sub(" '' ", _OPEN_QUOTE.sub(r"\1 `` ", str(text).lower()))
+    return " ".join(_TOKEN.findall(text))
+
+
+def clean_texts(texts) -> pd.Series:
+    """Vectorized clean_text_fast over a Series or list of headlines"""
+    series = texts if isinstance(texts, pd.Series) else pd.Series(list(texts), dtype=object)
+    return (
+        # Missing headlines stay empty rather than becoming the token "nan"
+        series.fillna("").astype(str).str.lower()
+        .str.replace(_OPEN_QUOTE, r"\1 `` ", regex=True)
+        .str.replace(_CLOSE_QUOTE, " '' ", regex=True)
+        .str.findall(_TOKEN).str.join(" ")
+    )
+
+
+def benchmark(n_headlines: int = 20000):
+    """Compare NLTK init/import and per-headline cost against the regex path"""
+    samples = [
+        "Apple's shares surge 5.2% after record Q3 earnings beat expectations",
+        "Tesla stock doesn't recover as U.S. deliveries miss estimates...",
+        "Microsoft, OpenAI announce $10bn AI-driven cloud partnership",
+        "S&P 500 slips; investors weigh Fed's next move on rates",
+    ]
+    headlines = pd.Series([samples[i % len(samples)] for i in range(n_headlines)])
+
+    start = time.perf_counter()
+    ensure_nltk()
+    from nltk.tokenize import word_tokenize  # noqa: F401
+    init_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    nltk_out = headlines.apply(clean_text)
+    nltk_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    fast_out = clean_texts(headlines)
+    fast_s = time.perf_counter() - start
+
+    agreement = (nltk_out == fast_out).mean()
+    print(f"NLTK import + resource check: {init_s * 1000:8.1f} ms (previously paid at module import)")
+    print(f"clean_text (NLTK):            {nltk_s / n_headlines * 1e6:8.2f} us/headline")
+    print(f"clean_texts (regex, .str):    {fast_s / n_headlines * 1e6:8.2f} us/headline")
+    print(f"Speedup: {nltk_s / fast_s:.1f}x, identical output on {agreement:.0%} of headlines")
+
+
+if __name__ == "__main__":
+    if "--benchmark" in sys.argv:
+        benchmark()
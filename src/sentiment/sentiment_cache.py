@@ -0,0 +1,82 @@
+"""
+Persistent sentiment memo cache
+SQLite table mapping (hash of normalized headline, scorer version) to the
+cleaned text and score, so a headline is only scored once per scorer version
+no matter how many runs or sources it shows up in
+"""
+import os
+import sqlite3
+from typing import Dict, Iterable, List, Tuple
+
+from src.utils.config import Config
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# SQLite's default host-parameter limit is 999
+_QUERY_BATCH = 900
+
+
+class SentimentCache:
+    """Bulk get/put cache of headline scores for one scorer version"""
+
+    def __init__(self, scorer_version: str, path: str = Config.SENTIMENT_CACHE_DB):
+        self.scorer_version = scorer_version
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._conn = sqlite3.connect(path)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS sentiment_cache ("
+            " headline_hash TEXT NOT NULL,"
+            " scorer_version TEXT NOT NULL,"
+            " clean_headline TEXT,"
+            " score REAL NOT NULL,"
+            " PRIMARY KEY (headline_hash, scorer_version))"
+        )
+        self._invalidate_stale_versions()
+
+    def _invalidate_stale_versions(self):
+        """Drop entries written by older versions of the same engine ("<engine>-<n>")"""
+        engine = self.scorer_version.rsplit("-", 1)[0]
+        with self._conn:
+            deleted = self._conn.execute(
+                "DELETE FROM sentiment_cache WHERE scorer_version LIKE ? AND scorer_version != ?",
+                (f"{engine}-%", self.scorer_version),
+            ).rowcount
+        if deleted:
+            logger.info(f"Sentiment cache: invalidated {deleted} entries from older scorer versions")
+
+    def get_many(self, hashes: Iterable[str]) -> Dict[str, Tuple[str, float]]:
+        """Return {hash: (clean_headline, score)} for every cached hash"""
+        unique = list(dict.fromkeys(hashes))
+        found = {}
+        for i in range(0, len(unique), _QUERY_BATCH):
+            batch = unique[i:i + _QUERY_BATCH]
+            placeholders = ",".join("?" * len(batch))
+            rows = self._conn.execute(
+                f"SELECT headline_hash, clean_headline, score FROM sentiment_cache "
+                f"WHERE scorer_version = ? AND headline_hash IN ({placeholders})",
+                [self.scorer_version, *batch],
+            )
+            for h, clean, score in rows:
+                found[h] = (clean, score)
+
+        self.hits += len(found)
+        self.misses += len(unique) - len(found)
+        return found
+
+    def put_many(self, entries: List[Tuple[str, str, float]]):
+        """Insert (hash, clean_headline, score) rows in one transaction"""
+        with self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO sentiment_cache VALUES (?, ?, ?, ?)",
+                [(h, self.scorer_version, clean, float(score)) for h, clean, score in entries],
+            )
+
+    def stats(self) -> dict:
+        return {"hits": self.hits, "misses": self.misses}
+
+    def close(self):
+        self._conn.close()
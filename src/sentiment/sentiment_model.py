@@ -2,20 +2,33 @@
 Enhanced Sentiment Analysis for Multi-Source News
 Analyzes sentiment from multiple news sources and categorizes as positive/negative/neutral
 """
-from textblob import TextBlob
 import pandas as pd
 import os
+import sys
+from src.utils.article_keys import article_keys, story_keys
 from src.utils.helpers import save_csv
 from src.utils.logger import get_logger
-from src.sentiment.preprocess_text import clean_text
 
 logger = get_logger(__name__)
 
+# Bump whenever cleaning or scoring changes so cached scores are invalidated
+SCORER_VERSION = "textblob-2"
+
+NEWS_FILES = [
+    "data/raw/news/multisource_news.csv",
+    "data/raw/news/news_bs4.csv",
+    "data/raw/news/news_selenium.csv",
+    "data/processed/merged/news_merged.csv"
+]
+SENTIMENT_OUTPUT = "data/raw/sentiment/sentiment_scores.csv"
+
 
 def sentiment_score(text):
     """Calculate sentiment polarity score (-1 to 1)"""
     if pd.isna(text) or not text or len(str(text).strip()) == 0:
         return 0.0
+    # Imported on first use: textblob pulls in NLTK, which is slow to import
+    from textblob import TextBlob
     try:
         return TextBlob(str(text)).sentiment.polarity
     except Exception as e:
@@ -33,24 +46,24 @@ def categorize_sentiment(score):
         return "neutral"
 
 
-def generate_sentiment(news_file=None):
+def generate_sentiment(news_file=None, workers=None, use_cache=True, engine="textblob"):
     """
     Generate sentiment scores for news articles
     
     Args:
         news_file: Path to news CSV file. If None, tries multiple sources.
+        workers: Processes for batch scoring (default: all cores, 1 = in-process)
+        use_cache: Reuse persisted scores for headlines seen in earlier runs
+        engine: Scoring engine, "textblob" (default), "lexicon" (finance lexicon)
+            or "linear" (trained hashed-feature classifier, see linear_engine.py)
     """
+    from src.sentiment.batch_scoring import engine_version
+    from src.sentiment.sentiment_cache import SentimentCache
+
     # Try multiple news file sources
     if news_file is None:
-        news_files = [
-            "data/raw/news/multisource_news.csv",
-            "data/raw/news/news_bs4.csv",
-            "data/raw/news/news_selenium.csv",
-            "data/processed/merged/news_merged.csv"
-        ]
-        
         df = None
-        for file_path in news_files:
+        for file_path in NEWS_FILES:
             if os.path.exists(file_path):
                 try:
                     df = pd.read_csv(file_path)
@@ -80,16 +93,22 @@ def generate_sentiment(news_file=None):
     logger.info(f"Processing sentiment for {len(df)} news articles...")
     
     # Clean and calculate sentiment
-    df["clean_headline"] = df["headline"].apply(clean_text)
-    df["sentiment_score"] = df["clean_headline"].apply(sentiment_score)
-    df["sentiment"] = df["sentiment_score"].apply(categorize_sentiment)
+    cache = SentimentCache(engine_version(engine)) if use_cache else None
+    try:
+        df = _add_scores(df, workers, cache, engine)
+    finally:
+        if cache is not None:
+            cache.close()
     
     # Save results
-    output_dir = "data/raw/sentiment"
-    os.makedirs(output_dir, exist_ok=True)
-    
-    output_file = os.path.join(output_dir, "sentiment_scores.csv")
+    output_file = SENTIMENT_OUTPUT
+    os.makedirs(os.path.dirname(output_file), exist_ok=True)
     save_csv(df, output_file)
+
+    # Full rescore: rebuild the materialized per-symbol series
+    from src.sentiment.sentiment_series import series_for
+    for series in series_for():
+        series.rebuild(df)
     
     # Print summary
     sentiment_counts = df["sentiment"].value_counts()
@@ -108,5 +127,135 @@ def generate_sentiment(news_file=None):
     return df
 
 
+def _add_scores(df, workers, cache, engine, executor=None):
+    """
+    Add clean_headline, sentiment_score and sentiment columns
+
+    When articles carry a story_id (near-duplicate cluster from the
+    scraper), only the first headline of each story is scored and its
+    score is shared by the whole story. Rows without a story_id are
+    scored on their own. executor is a scoring_pool() to reuse.
+    """
+    from src.sentiment.batch_scoring import score_headlines
+    from src.sentiment.preprocess_text import clean_texts
+
+    if "story_id" in df.columns:
+        keys = story_keys(df)
+        first = ~keys.duplicated()
+        _, story_scores = score_headlines(df.loc[first, "headline"], workers=workers, cache=cache,
+                                          engine=engine, executor=executor)
+        score_by_story = pd.Series(story_scores, index=keys[first].values)
+        df["clean_headline"] = clean_texts(df["headline"]).values
+        df["sentiment_score"] = keys.map(score_by_story).values
+    else:
+        df["clean_headline"], df["sentiment_score"] = score_headlines(
+            df["headline"], workers=workers, cache=cache, engine=engine, executor=executor
+        )
+    df["sentiment"] = df["sentiment_score"].apply(categorize_sentiment)
+    return df
+
+
+def generate_sentiment_incremental(news_file=None, chunk_size=5000, workers=None, use_cache=True,
+                                   engine="textblob"):
+    """
+    Score only articles not yet in the sentiment output and append them
+
+    The news file is streamed in chunks, so memory is bounded by chunk_size
+    (plus the set of already-scored article keys), and runtime scales with
+    the number of new articles rather than the size of the news history.
+
+    Args:
+        news_file: Path to news CSV file. If None, uses the first existing NEWS_FILES entry.
+        chunk_size: News rows read and scored per chunk
+        workers: Processes for batch scoring (default: all cores, 1 = in-process)
+        use_cache: Reuse persisted scores for headlines seen in earlier runs
+        engine: Scoring engine, "textblob" (default), "lexicon" (finance lexicon)
+            or "linear" (trained hashed-feature classifier, see linear_engine.py)
+    """
+    from src.sentiment.batch_scoring import engine_version, scoring_pool
+    from src.sentiment.sentiment_cache import SentimentCache
+
+    if news_file is None:
+        news_file = next((f for f in NEWS_FILES if os.path.exists(f)), None)
+    if news_file is None or not os.path.exists(news_file):
+        logger.error(f"News file not found: {news_file}")
+        print("❌ No news data files found. Please run the news scraper first:")
+        print("   python -m src.scraping.multisource_scraper")
+        return
+
+    output_file = SENTIMENT_OUTPUT
+    os.makedirs(os.path.dirname(output_file), exist_ok=True)
+
+    seen = set()
+    output_columns = None
+    if os.path.exists(output_file):
+        output_columns = pd.read_csv(output_file, nrows=0).columns.tolist()
+        key_columns = [c for c in ("headline", "url") if c in output_columns]
+        for existing in pd.read_csv(output_file, usecols=key_columns, chunksize=chunk_size):
+            seen.update(article_keys(existing))
+
+    from src.sentiment.sentiment_series import series_for
+    series_list = series_for()
+    partials = {series.bucket: [] for series in series_list}
+
+    cache = SentimentCache(engine_version(engine)) if use_cache else None
+    # One worker pool for every chunk instead of a fresh pool per chunk
+    executor = scoring_pool(workers, engine)
+    total, added = 0, 0
+    counts = pd.Series(dtype=int)
+    try:
+        for chunk in pd.read_csv(news_file, chunksize=chunk_size):
+            if "headline" not in chunk.columns:
+                logger.error("No 'headline' column found in news data")
+                print(f"❌ Available columns: {chunk.columns.tolist()}")
+                return
+            total += len(chunk)
+
+            keys = article_keys(chunk)
+            new_mask = ~keys.isin(seen) & ~keys.duplicated()
+            chunk = chunk[new_mask.values]
+            if chunk.empty:
+                continue
+            seen.update(keys[new_mask])
+
+            chunk = _add_scores(chunk.copy(), workers, cache, engine, executor)
+
+            if output_columns is None:
+                output_columns = chunk.columns.tolist()
+                chunk.to_csv(output_file, index=False)
+            else:
+                chunk.reindex(columns=output_columns).to_csv(output_file, mode="a", header=False, index=False)
+            added += len(chunk)
+            counts = counts.add(chunk["sentiment"].value_counts(), fill_value=0)
+            for series in series_list:
+                partials[series.bucket].append(series.aggregate(chunk))
+    finally:
+        if executor is not None:
+            executor.shutdown()
+        if cache is not None:
+            cache.close()
+
+    # Fold only the new articles into the materialized series
+    for series in series_list:
+        if partials[series.bucket]:
+            series.merge(pd.concat(partials[series.bucket], ignore_index=True))
+
+    logger.info(f"Incremental sentiment: {added} new of {total} articles in {news_file}")
+    print(f"\n✅ Incremental sentiment analysis completed!")
+    print(f"📊 Appended {added} new articles to: {output_file} ({total - added} already scored)")
+    print(f"   Positive: {int(counts.get('positive', 0))}")
+    print(f"   Negative: {int(counts.get('negative', 0))}")
+    print(f"   Neutral: {int(counts.get('neutral', 0))}")
+    return added
+
+
 if __name__ == "__main__":
-    generate_sentiment()
+    engine = "textblob"
+    if "--lexicon" in sys.argv:
+        engine = "lexicon"
+    elif "--linear" in sys.argv:
+        engine = "linear"
+    if "--incremental" in sys.argv:
+        generate_sentiment_incremental(engine=engine)
+    else:
+        generate_sentiment(engine=engine)
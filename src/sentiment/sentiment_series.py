@@ -0,0 +1,242 @@
+"""
+Materialized per-symbol sentiment time series
+Pre-aggregates scored articles into (symbol, bucket) rows with counts, mean
+score, a rolling mean and an exponentially decayed score, so dashboards
+and models read a small table instead of regrouping every article.
+Rows are stored in symbol=SYM/part=PERIOD.csv partitions (a day of 5m
+buckets, a month of 1h, a year of 1d); merging new articles rewrites only
+the affected symbols' partitions from the earliest changed bucket on,
+resuming the decay from the state stored on the last unchanged bucket.
+"""
+import os
+import shutil
+from typing import List
+
+import numpy as np
+import pandas as pd
+
+from src.utils.article_keys import story_keys
+from src.utils.config import Config
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# bucket -> (pandas frequency, rolling window, decay half-life, partition strftime)
+BUCKETS = {
+    "5m": ("5min", "1h", "30min", "%Y-%m-%d"),
+    "1h": ("1h", "1D", "6h", "%Y-%m"),
+    "1d": ("1D", "7D", "3D", "%Y"),
+}
+
+KEY_COLUMNS = ["symbol", "bucket_start"]
+SUM_COLUMNS = ["count", "score_sum", "positive", "negative", "neutral"]
+STATE_COLUMNS = ["decayed_sum", "decayed_count"]
+
+
+class SentimentSeries:
+    """Incrementally maintained sentiment aggregates at one bucket size"""
+
+    def __init__(self, bucket: str = "1h", base_dir: str = Config.SENTIMENT_SERIES_DIR):
+        if bucket not in BUCKETS:
+            raise ValueError(f"Unknown bucket '{bucket}'. Choose from: {', '.join(BUCKETS)}")
+        self.bucket = bucket
+        self.freq, self.rolling_window, self.half_life, self.partition_format = BUCKETS[bucket]
+        self.base_dir = os.path.join(base_dir, f"sentiment_{bucket}")
+        # Single-file table written by earlier versions; migrated on first use
+        self.legacy_path = os.path.join(base_dir, f"sentiment_{bucket}.csv")
+
+    def aggregate(self, scored: pd.DataFrame, time_column: str = None) -> pd.DataFrame:
+        """Sum scored articles into (symbol, bucket_start) partial aggregates"""
+        time_column = time_column or next(
+            (c for c in ("published_at", "scraped_at") if c in scored.columns), None
+        )
+        if scored.empty or time_column is None or "symbol" not in scored.columns:
+            return pd.DataFrame(columns=["symbol", "bucket_start"] + SUM_COLUMNS)
+        if "story_id" in scored.columns:
+            # Syndicated copies of one story count once per symbol; rows
+            # without a story_id each count
+            keys = pd.DataFrame({"symbol": scored["symbol"], "story": story_keys(scored)})
+            scored = scored[~keys.duplicated().values]
+
+        ts = pd.to_datetime(scored[time_column], errors="coerce", utc=True).dt.tz_localize(None)
+        frame = pd.DataFrame({
+            "symbol": scored["symbol"].values,
+            "bucket_start": ts.dt.floor(self.freq).values,
+            "count": 1,
+            "score_sum": scored["sentiment_score"].astype(float).values,
+            "positive": (scored["sentiment"] == "positive").astype(int).values,
+            "negative": (scored["sentiment"] == "negative").astype(int).values,
+            "neutral": (scored["sentiment"] == "neutral").astype(int).values,
+        }).dropna(subset=["bucket_start"])
+        return frame.groupby(["symbol", "bucket_start"], as_index=False)[SUM_COLUMNS].sum()
+
+    def _symbol_dir(self, symbol: str) -> str:
+        return os.path.join(self.base_dir, f"symbol={symbol}")
+
+    def _partitions(self, symbol: str) -> List[str]:
+        """Sorted partition keys stored for a symbol"""
+        symbol_dir = self._symbol_dir(symbol)
+        if not os.path.isdir(symbol_dir):
+            return []
+        return sorted(f[len("part="):-len(".csv")] for f in os.listdir(symbol_dir)
+                      if f.startswith("part=") and f.endswith(".csv"))
+
+    def _partition_key(self, bucket_start) -> str:
+        return pd.Timestamp(bucket_start).strftime(self.partition_format)
+
+    def _read(self, symbol: str, keys: List[str]) -> pd.DataFrame:
+        frames = [pd.read_csv(os.path.join(self._symbol_dir(symbol), f"part={key}.csv"), parse_dates=["bucket_start"])
+                  for key in keys]
+        return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+
+    def _write(self, table: pd.DataFrame):
+        """Replace the partitions covered by table's rows"""
+        keys = table["bucket_start"].dt.strftime(self.partition_format)
+        for (symbol, key), part in table.groupby([table["symbol"], keys]):
+            os.makedirs(self._symbol_dir(symbol), exist_ok=True)
+            path = os.path.join(self._symbol_dir(symbol), f"part={key}.csv")
+            tmp_path = f"{path}.tmp"
+            part.to_csv(tmp_path, index=False)
+            os.replace(tmp_path, path)
+
+    def _migrate_legacy(self):
+        if not os.path.exists(self.legacy_path):
+            return
+        legacy = pd.read_csv(self.legacy_path, parse_dates=["bucket_start"])
+        if not legacy.empty:
+            self._write(self._derive(legacy[KEY_COLUMNS + SUM_COLUMNS]))
+        os.remove(self.legacy_path)
+        logger.info(f"Sentiment series {self.bucket}: migrated {len(legacy)} buckets to {self.base_dir}")
+
+    def symbols(self) -> List[str]:
+        if not os.path.isdir(self.base_dir):
+            return []
+        return sorted(d[len("symbol="):] for d in os.listdir(self.base_dir) if d.startswith("symbol="))
+
+    def load(self, symbols: List[str] = None) -> pd.DataFrame:
+        """Stored buckets, reading only the requested symbols' partitions"""
+        self._migrate_legacy()
+        frames = [self._read(symbol, self._partitions(symbol)) for symbol in (symbols or self.symbols())]
+        frames = [frame for frame in frames if not frame.empty]
+        if not frames:
+            return pd.DataFrame()
+        return pd.concat(frames, ignore_index=True)
+
+    def merge(self, partial: pd.DataFrame) -> pd.DataFrame:
+        """
+        Fold new partial aggregates into the stored series
+
+        Only the symbols in partial are touched, and for each of them only
+        the partitions from its earliest changed bucket onward are read and
+        rewritten; the rolling window reads back just far enough for context.
+        Returns the recomputed buckets.
+        """
+        if partial.empty:
+            return pd.DataFrame()
+        self._migrate_legacy()
+        partial = partial.groupby(KEY_COLUMNS, as_index=False)[SUM_COLUMNS].sum()
+
+        updated = []
+        for symbol, new in partial.groupby("symbol"):
+            updated.append(self._merge_symbol(symbol, new))
+        table = pd.concat(updated, ignore_index=True)
+        logger.info(f"Sentiment series {self.bucket}: recomputed {len(table)} buckets "
+                    f"for {table['symbol'].nunique()} symbols")
+        return table
+
+    def _merge_symbol(self, symbol: str, new: pd.DataFrame) -> pd.DataFrame:
+        first = new["bucket_start"].min()
+        first_key = self._partition_key(first)
+        window_key = self._partition_key(first - pd.Timedelta(self.rolling_window))
+        stored_keys = self._partitions(symbol)
+        earlier = [key for key in stored_keys if key < first_key]
+        # Partitions holding the rolling context, plus the last earlier one for the decay seed
+        read_from = min([window_key] + earlier[-1:])
+        stored = self._read(symbol, [key for key in stored_keys if key >= read_from])
+
+        if stored.empty:
+            kept = changed = stored
+        else:
+            changed_mask = stored["bucket_start"] >= first
+            kept, changed = stored[~changed_mask], stored[changed_mask]
+        region = pd.concat([changed[KEY_COLUMNS + SUM_COLUMNS], new], ignore_index=True) if not changed.empty else new
+        region = region.groupby(KEY_COLUMNS, as_index=False)[SUM_COLUMNS].sum()
+        context = seeds = None
+        if not kept.empty:
+            kept = kept.sort_values("bucket_start")
+            context = kept[kept["bucket_start"] > first - pd.Timedelta(self.rolling_window)]
+            seeds = kept.groupby("symbol")[["bucket_start"] + STATE_COLUMNS].last()
+
+        derived = self._derive(region, context, seeds)
+        # The first rewritten partition also keeps its buckets from before `first`
+        head = kept[kept["bucket_start"].dt.strftime(self.partition_format) >= first_key] if not kept.empty else kept
+        self._write(pd.concat([head, derived], ignore_index=True) if not head.empty else derived)
+        return derived
+
+    def update(self, scored: pd.DataFrame) -> pd.DataFrame:
+        """Add newly scored articles to the materialized series"""
+        return self.merge(self.aggregate(scored))
+
+    def rebuild(self, scored: pd.DataFrame) -> pd.DataFrame:
+        """Replace the materialized series with aggregates of scored"""
+        if os.path.exists(self.legacy_path):
+            os.remove(self.legacy_path)
+        if os.path.isdir(self.base_dir):
+            shutil.rmtree(self.base_dir)
+        return self.update(scored)
+
+    def _derive(self, table: pd.DataFrame, context: pd.DataFrame = None,
+                seeds: pd.DataFrame = None) -> pd.DataFrame:
+        """
+        Add mean, rolling and decayed scores to table
+
+        Args:
+            table: Summed buckets to derive columns for
+            context: Earlier buckets that only feed the rolling window
+            seeds: Per-symbol bucket_start and decay state to resume from
+        """
+        table = table.sort_values(KEY_COLUMNS).reset_index(drop=True)
+        table["mean_score"] = table["score_sum"] / table["count"]
+
+        # Count-weighted mean over a trailing time window
+        frame = table[KEY_COLUMNS + ["score_sum", "count"]].assign(_context=False)
+        if context is not None and not context.empty:
+            frame = pd.concat([context[KEY_COLUMNS + ["score_sum", "count"]].assign(_context=True), frame])
+            frame = frame.sort_values(KEY_COLUMNS).reset_index(drop=True)
+        rolled = (
+            frame.set_index("bucket_start")
+            .groupby("symbol")[["score_sum", "count"]]
+            .rolling(self.rolling_window).sum()
+            .reset_index(drop=True)
+        )[~frame["_context"].values].reset_index(drop=True)
+        table["rolling_mean_score"] = rolled["score_sum"] / rolled["count"]
+
+        # Decay both score and count by elapsed time so sparse buckets age correctly
+        half_life_s = pd.Timedelta(self.half_life).total_seconds()
+        decayed_sum = np.empty(len(table))
+        decayed_count = np.empty(len(table))
+        for symbol, idx in table.groupby("symbol").indices.items():
+            times = table["bucket_start"].values[idx].astype("datetime64[s]").astype(np.int64)
+            sums = table["score_sum"].values[idx]
+            counts = table["count"].values[idx]
+            if seeds is not None and symbol in seeds.index:
+                seed = seeds.loc[symbol]
+                prev = np.datetime64(seed["bucket_start"], "s").astype(np.int64)
+                d_sum, d_count = float(seed["decayed_sum"]), float(seed["decayed_count"])
+            else:
+                d_sum = d_count = 0.0
+                prev = times[0]
+            for j, (t, s, c) in enumerate(zip(times, sums, counts)):
+                factor = 0.5 ** ((t - prev) / half_life_s)
+                d_sum, d_count = d_sum * factor + s, d_count * factor + c
+                decayed_sum[idx[j]], decayed_count[idx[j]] = d_sum, d_count
+                prev = t
+        table["decayed_score"] = decayed_sum / decayed_count
+        # Decay state, so later merges resume from the last unchanged bucket
+        table["decayed_sum"] = decayed_sum
+        table["decayed_count"] = decayed_count
+        return table
+
+
+def series_for(buckets: List[str] = None) -> List[SentimentSeries]:
+    return [SentimentSeries(bucket) for bucket in (buckets or Config.SENTIMENT_SERIES_BUCKETS)]
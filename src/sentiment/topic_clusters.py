@@ -0,0 +1,229 @@
+"""
+Incremental Headline Topic Clustering
+Vectorizes headlines with a stateless HashingVectorizer (weighted by a
+running IDF) and updates MiniBatchKMeans topics batch by batch. State is
+a fixed-size document-frequency vector, the centroids, capped per-topic
+term counts and per-(symbol, topic) counters, so memory does not grow
+with the number of articles seen.
+"""
+import os
+import sys
+from collections import Counter, defaultdict
+from typing import List
+
+import joblib
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+from sklearn.cluster import MiniBatchKMeans
+from sklearn.feature_extraction.text import ENGLISH_STOP_WORDS, HashingVectorizer
+from sklearn.preprocessing import normalize
+
+from src.utils.article_keys import article_keys
+from src.utils.config import Config
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Terms kept per topic for labels; the rest are pruned after each batch
+MAX_TERMS_PER_TOPIC = 200
+
+
+class HeadlineTopics:
+    """Streaming topic model over headlines with per-symbol summaries"""
+
+    def __init__(self, n_topics: int = Config.TOPIC_CLUSTERS, n_features: int = 2 ** 16,
+                 batch_size: int = 1024, random_state: int = 42):
+        self.n_topics = n_topics
+        self.vectorizer = HashingVectorizer(
+            n_features=n_features, alternate_sign=False, norm=None,
+            stop_words="english", ngram_range=(1, 2),
+        )
+        self.kmeans = MiniBatchKMeans(
+            n_clusters=n_topics, batch_size=batch_size, random_state=random_state, n_init=3,
+        )
+        self.doc_freq = np.zeros(n_features, dtype=np.float64)
+        self.n_docs = 0
+        self.fitted = False
+        self.topic_terms = defaultdict(Counter)
+        self.symbol_topics = defaultdict(Counter)
+        # Rows held back until there are enough to initialize n_topics centroids
+        self._pending = None
+        self._pending_symbols = []
+        self._pending_headlines = []
+        # Rows of the sentiment output already consumed by update_from_file(),
+        # with the article keys of the first and last of them to detect rewrites
+        self.rows_consumed = 0
+        self._first_key = None
+        self._last_key = None
+
+    def _weight(self, counts: sp.csr_matrix) -> sp.csr_matrix:
+        idf = np.log((1 + self.n_docs) / (1 + self.doc_freq)) + 1.0
+        return normalize(counts.multiply(idf).tocsr())
+
+    def partial_fit(self, headlines: List[str], symbols: List[str] = None) -> np.ndarray:
+        """
+        Update topics with a batch of headlines and return their topic ids
+
+        Args:
+            headlines: Raw or cleaned headline texts
+            symbols: Symbol per headline, counted for per-symbol summaries
+
+        Returns:
+            Topic id per headline (-1 while the model is still warming up)
+        """
+        headlines = [str(h) for h in headlines]
+        symbols = list(symbols) if symbols is not None else [None] * len(headlines)
+        if not headlines:
+            return np.array([], dtype=int)
+
+        counts = self.vectorizer.transform(headlines)
+        self.doc_freq += np.asarray((counts > 0).sum(axis=0)).ravel()
+        self.n_docs += counts.shape[0]
+
+        if not self.fitted:
+            self._pending = counts if self._pending is None else sp.vstack([self._pending, counts]).tocsr()
+            self._pending_symbols.extend(symbols)
+            self._pending_headlines.extend(headlines)
+            if self._pending.shape[0] < self.n_topics:
+                logger.info(f"Topic model warming up: {self._pending.shape[0]}/{self.n_topics} headlines")
+                return np.full(len(headlines), -1)
+            X = self._weight(self._pending)
+            pending_labels = self.kmeans.partial_fit(X).predict(X)
+            self.fitted = True
+            self._count(pending_labels, self._pending_symbols, self._pending_headlines)
+            self._pending, self._pending_symbols, self._pending_headlines = None, [], []
+            return pending_labels[-len(headlines):]
+
+        X = self._weight(counts)
+        labels = self.kmeans.partial_fit(X).predict(X)
+        self._count(labels, symbols, headlines)
+        return labels
+
+    def predict(self, headlines: List[str]) -> np.ndarray:
+        if not self.fitted:
+            return np.full(len(headlines), -1)
+        return self.kmeans.predict(self._weight(self.vectorizer.transform([str(h) for h in headlines])))
+
+    def _count(self, labels, symbols, headlines):
+        for label, symbol in zip(labels, symbols):
+            if symbol is not None:
+                self.symbol_topics[symbol][int(label)] += 1
+        if headlines is None:
+            return
+        analyzer = self.vectorizer.build_analyzer()
+        for label, headline in zip(labels, headlines):
+            terms = self.topic_terms[int(label)]
+            terms.update(t for t in analyzer(headline) if " " not in t and t not in ENGLISH_STOP_WORDS and len(t) > 2)
+            if len(terms) > 2 * MAX_TERMS_PER_TOPIC:
+                self.topic_terms[int(label)] = Counter(dict(terms.most_common(MAX_TERMS_PER_TOPIC)))
+
+    def topic_labels(self, n_terms: int = 5) -> dict:
+        return {
+            topic: ", ".join(term for term, _ in terms.most_common(n_terms))
+            for topic, terms in self.topic_terms.items()
+        }
+
+    def symbol_summary(self, symbols: List[str] = None, top_n: int = 5) -> pd.DataFrame:
+        """Top topics per symbol with article counts, share and keyword label"""
+        labels = self.topic_labels()
+        rows = []
+        for symbol, topics in self.symbol_topics.items():
+            if symbols and symbol not in symbols:
+                continue
+            total = sum(topics.values())
+            for topic, count in topics.most_common(top_n):
+                rows.append({
+                    "symbol": symbol,
+                    "topic": topic,
+                    "articles": count,
+                    "share": round(count / total, 3),
+                    "keywords": labels.get(topic, ""),
+                })
+        return pd.DataFrame(rows, columns=["symbol", "topic", "articles", "share", "keywords"])
+
+    def _reset(self):
+        """Fresh model with the same settings; counters and centroids start over"""
+        self.__init__(self.n_topics, self.vectorizer.n_features, self.kmeans.batch_size, self.kmeans.random_state)
+
+    def update_from_file(self, path: str, chunk_size: int = 5000) -> int:
+        """
+        Feed rows appended to path since the last call; returns rows consumed
+
+        If the file was rewritten (e.g. by a full generate_sentiment) rather
+        than appended to, the model is reset and rebuilt from the whole file,
+        so per-symbol counts never include rows twice or skip new content.
+        """
+        if not os.path.exists(path):
+            logger.warning(f"No headlines to cluster at {path}")
+            return 0
+        columns = pd.read_csv(path, nrows=0).columns
+        text_column = "clean_headline" if "clean_headline" in columns else "headline"
+        key_columns = [c for c in ("headline", "url") if c in columns]
+        usecols = list(dict.fromkeys([text_column] + key_columns + (["symbol"] if "symbol" in columns else [])))
+
+        # Offsets are CSV rows, not lines: quoted headlines may contain newlines
+        consumed = 0
+        position = 0
+        first_key = last_key = None
+        rewritten = False
+        for chunk in pd.read_csv(path, usecols=usecols, chunksize=chunk_size):
+            keys = article_keys(chunk) if "headline" in chunk.columns else None
+            if position == 0 and keys is not None and len(chunk):
+                first_key = keys.iloc[0]
+            already = self.rows_consumed - position
+            if keys is not None and 0 < already <= len(chunk):
+                # Chunk holds the last consumed row; it must be the same article
+                last_key = keys.iloc[already - 1]
+            position += len(chunk)
+            rewritten = self.rows_consumed and (
+                (first_key is not None and self._first_key not in (None, first_key)) or
+                (last_key is not None and self._last_key not in (None, last_key))
+            )
+            if rewritten:
+                break
+            if already >= len(chunk):
+                continue
+            chunk = chunk.iloc[max(already, 0):]
+            self.partial_fit(chunk[text_column].fillna("").tolist(),
+                             chunk["symbol"].tolist() if "symbol" in chunk.columns else None)
+            consumed += len(chunk)
+            if keys is not None:
+                last_key = keys.iloc[-1]
+
+        if self.rows_consumed and (rewritten or position < self.rows_consumed):
+            # Rewritten by a full rescore: counters would double-count re-read
+            # rows or miss replaced ones, so rebuild from scratch
+            logger.warning(f"{path} was rewritten since the last update; rebuilding topics from the start")
+            self._reset()
+            return self.update_from_file(path, chunk_size)
+
+        self.rows_consumed += consumed
+        if consumed:
+            self._first_key = first_key
+            self._last_key = last_key
+        logger.info(f"Topic model consumed {consumed} new headlines ({self.n_docs} total)")
+        return consumed
+
+    def save(self, path: str = Config.TOPIC_MODEL_FILE):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        joblib.dump(self, path)
+
+    @staticmethod
+    def load(path: str = Config.TOPIC_MODEL_FILE) -> "HeadlineTopics":
+        """Load the persisted model, or a fresh one if none exists"""
+        if os.path.exists(path):
+            return joblib.load(path)
+        return HeadlineTopics()
+
+
+if __name__ == "__main__":
+    from src.sentiment.sentiment_model import SENTIMENT_OUTPUT
+
+    topics = HeadlineTopics.load()
+    if "--reset" in sys.argv:
+        topics = HeadlineTopics()
+    consumed = topics.update_from_file(SENTIMENT_OUTPUT)
+    topics.save()
+    print(f"✅ Clustered {consumed} new headlines into {topics.n_topics} topics")
+    print(topics.symbol_summary().to_string(index=False))
@@ -0,0 +1,270 @@
+"""
+Pipelined News Sentiment Stream
+Scrape -> normalize -> score -> persist stages connected by bounded queues,
+so sentiment for the first articles is written while later sources are
+still being fetched. Each stage reports throughput and queue depth.
+"""
+import os
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import List
+
+import pandas as pd
+
+from src.scraping.multisource_scraper import MultiSourceScraper
+from src.scraping.near_duplicates import StoryIndex
+from src.sentiment.batch_scoring import engine_version
+from src.sentiment.sentiment_cache import SentimentCache
+from src.sentiment.sentiment_model import SENTIMENT_OUTPUT, _add_scores
+from src.sentiment.sentiment_series import series_for
+from src.utils.article_keys import article_keys
+from src.utils.config import Config
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Marks the end of the stream on every queue
+_DONE = object()
+
+
+class StageStats:
+    """Counters for one pipeline stage"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.batches = 0
+        self.rows = 0
+        self.busy_s = 0.0
+        self.max_queue_depth = 0
+        self.first_output_s = None
+
+    def as_dict(self, elapsed_s: float) -> dict:
+        return {
+            "stage": self.name,
+            "batches": self.batches,
+            "rows": self.rows,
+            "busy_s": round(self.busy_s, 3),
+            "rows_per_s": round(self.rows / self.busy_s, 1) if self.busy_s else 0.0,
+            "utilization": round(self.busy_s / elapsed_s, 3) if elapsed_s else 0.0,
+            "max_input_queue_depth": self.max_queue_depth,
+            "first_output_s": self.first_output_s,
+        }
+
+
+class NewsPipeline:
+    """Concurrent scrape -> normalize -> score -> append pipeline"""
+
+    def __init__(self, symbols: List[str] = None, queue_size: int = Config.PIPELINE_QUEUE_SIZE,
+                 fetch_workers: int = 5, engine: str = "textblob", use_cache: bool = True,
+                 output_file: str = SENTIMENT_OUTPUT):
+        self.symbols = symbols or Config.STOCKS
+        self.scraper = MultiSourceScraper(symbols=self.symbols)
+        self.fetch_workers = fetch_workers
+        self.engine = engine
+        self.use_cache = use_cache
+        self.output_file = output_file
+        # Bounded queues give back-pressure: a slow stage blocks its producer
+        self.scraped = queue.Queue(maxsize=queue_size)
+        self.normalized = queue.Queue(maxsize=queue_size)
+        self.scored = queue.Queue(maxsize=queue_size)
+        self.stats = {name: StageStats(name) for name in ("scrape", "normalize", "score", "persist")}
+        self._start = None
+        self._error = None
+        self._error_lock = threading.Lock()
+
+    def _put(self, q: queue.Queue, item, stats: StageStats):
+        q.put(item)
+        if stats.first_output_s is None and item is not _DONE:
+            stats.first_output_s = round(time.perf_counter() - self._start, 3)
+
+    def _get(self, q: queue.Queue, stats: StageStats):
+        stats.max_queue_depth = max(stats.max_queue_depth, q.qsize())
+        return q.get()
+
+    def _fail(self, stage: str, error: Exception):
+        """Record the first stage error; run() re-raises it once every stage has stopped"""
+        logger.error(f"News pipeline {stage} stage failed: {error}")
+        with self._error_lock:
+            if self._error is None:
+                self._error = error
+
+    @staticmethod
+    def _drain(q: queue.Queue):
+        """Consume a failed stage's input until _DONE so its producer never blocks on a full queue"""
+        while q.get() is not _DONE:
+            pass
+
+    def _scrape_stage(self):
+        stats = self.stats["scrape"]
+        tasks = [(symbol, source) for symbol in self.symbols for source in self.scraper.sources()]
+        try:
+            with ThreadPoolExecutor(max_workers=self.fetch_workers) as executor:
+                futures = {
+                    executor.submit(self.scraper.scrape_source, source, symbol): (symbol, source)
+                    for symbol, source in tasks
+                }
+                for future in as_completed(futures):
+                    if self._error is not None:
+                        # A later stage failed; stop fetching pages nobody will persist
+                        for pending in futures:
+                            pending.cancel()
+                        break
+                    symbol, source = futures[future]
+                    try:
+                        df = future.result()
+                    except Exception as e:
+                        logger.error(f"Pipeline scrape {source} failed for {symbol}: {e}")
+                        continue
+                    stats.batches += 1
+                    if not df.empty:
+                        stats.rows += len(df)
+                        self._put(self.scraped, df, stats)
+        except Exception as e:
+            self._fail("scrape", e)
+        finally:
+            stats.busy_s = time.perf_counter() - self._start
+            self.scraper.http.log_stats()
+            if self.scraper.parse_pool is not None:
+                self.scraper.parse_pool.log_stats()
+                self.scraper.parse_pool.close()
+            self.scraper.breakers.log_health()
+            self.scraped.put(_DONE)
+
+    def _normalize_stage(self):
+        stats = self.stats["normalize"]
+        seen = set()
+        stories = StoryIndex()
+        try:
+            while True:
+                df = self._get(self.scraped, stats)
+                if df is _DONE:
+                    logger.info(f"Near-duplicate detection: {stats.rows} headlines -> {len(stories)} stories")
+                    return
+                start = time.perf_counter()
+                # Same (headline, symbol) dedupe as scrape_multiple_stocks, across batches
+                keys = list(zip(df["headline"], df["symbol"]))
+                keep = [key not in seen for key in keys]
+                seen.update(keys)
+                df = df[keep]
+                if not df.empty:
+                    # One index across batches: each batch is a single source's
+                    # page, and syndicated copies come from different sources
+                    df = df.assign(story_id=stories.add(df["headline"].astype(str).tolist()))
+                stats.batches += 1
+                stats.rows += len(df)
+                stats.busy_s += time.perf_counter() - start
+                if not df.empty:
+                    self._put(self.normalized, df, stats)
+        except Exception as e:
+            self._fail("normalize", e)
+            self._drain(self.scraped)
+        finally:
+            self.normalized.put(_DONE)
+
+    def _score_stage(self):
+        stats = self.stats["score"]
+        cache = None
+        try:
+            cache = SentimentCache(engine_version(self.engine)) if self.use_cache else None
+            while True:
+                df = self._get(self.normalized, stats)
+                if df is _DONE:
+                    return
+                start = time.perf_counter()
+                df = _add_scores(df, 1, cache, self.engine)
+                stats.batches += 1
+                stats.rows += len(df)
+                stats.busy_s += time.perf_counter() - start
+                self._put(self.scored, df, stats)
+        except Exception as e:
+            self._fail("score", e)
+            self._drain(self.normalized)
+        finally:
+            if cache is not None:
+                cache.close()
+            self.scored.put(_DONE)
+
+    def _persist_stage(self):
+        stats = self.stats["persist"]
+        series_list = series_for()
+        partials = {series.bucket: [] for series in series_list}
+        try:
+            os.makedirs(os.path.dirname(self.output_file), exist_ok=True)
+            columns = None
+            # Articles already in the output (earlier runs) are neither appended
+            # again nor re-added to the series sums
+            seen = set()
+            if os.path.exists(self.output_file):
+                columns = pd.read_csv(self.output_file, nrows=0).columns.tolist()
+                key_columns = [c for c in ("headline", "url") if c in columns]
+                for existing in pd.read_csv(self.output_file, usecols=key_columns, chunksize=50_000):
+                    seen.update(article_keys(existing))
+
+            while True:
+                df = self._get(self.scored, stats)
+                if df is _DONE:
+                    break
+                start = time.perf_counter()
+                keys = article_keys(df)
+                new_mask = (~keys.isin(seen) & ~keys.duplicated()).values
+                df = df[new_mask]
+                if not df.empty:
+                    aggregates = [series.aggregate(df) for series in series_list]
+                    if columns is None:
+                        columns = df.columns.tolist()
+                        df.to_csv(self.output_file, index=False)
+                    else:
+                        df.reindex(columns=columns).to_csv(self.output_file, mode="a", header=False, index=False)
+                    seen.update(keys[new_mask])
+                    # Only batches whose rows reached the file count toward the series
+                    for series, aggregate in zip(series_list, aggregates):
+                        partials[series.bucket].append(aggregate)
+                stats.batches += 1
+                stats.rows += len(df)
+                stats.busy_s += time.perf_counter() - start
+                if stats.first_output_s is None:
+                    stats.first_output_s = round(time.perf_counter() - self._start, 3)
+        except Exception as e:
+            self._fail("persist", e)
+            self._drain(self.scored)
+
+        try:
+            for series in series_list:
+                if partials[series.bucket]:
+                    series.merge(pd.concat(partials[series.bucket], ignore_index=True))
+        except Exception as e:
+            self._fail("persist", e)
+
+    def run(self) -> List[dict]:
+        """
+        Run all stages to completion and return per-stage stats
+
+        Raises:
+            The first exception raised by any stage, after all stages have stopped
+        """
+        self._start = time.perf_counter()
+        self._error = None
+        threads = [
+            threading.Thread(target=stage, name=f"news-pipeline-{stage.__name__}", daemon=True)
+            for stage in (self._scrape_stage, self._normalize_stage, self._score_stage, self._persist_stage)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        elapsed = time.perf_counter() - self._start
+        report = [stats.as_dict(elapsed) for stats in self.stats.values()]
+        for row in report:
+            logger.info(f"News pipeline stage: {row}")
+        if self._error is not None:
+            raise self._error
+        logger.info(f"News pipeline finished in {elapsed:.2f}s")
+        return report
+
+
+if __name__ == "__main__":
+    report = NewsPipeline().run()
+    print(pd.DataFrame(report).to_string(index=False))
@@ -0,0 +1,43 @@
+"""
+Article identity keys
+Shared by the scrapers (seen index, news store) and the sentiment stages:
+an article is its URL, or the hash of its normalized headline when there
+is no URL.
+"""
+import hashlib
+import re
+
+import pandas as pd
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_headline(headline) -> str:
+    """Lowercase and collapse whitespace so trivially different copies share a key"""
+    return _WHITESPACE.sub(" ", str(headline)).strip().lower()
+
+
+def headline_hash(headline) -> str:
+    return hashlib.sha1(normalize_headline(headline).encode("utf-8")).hexdigest()
+
+
+def article_keys(df):
+    """Identify articles by URL, falling back to the normalized headline hash"""
+    headline_keys = df["headline"].map(headline_hash)
+    if "url" not in df.columns:
+        return headline_keys
+    urls = df["url"].astype("string").str.strip()
+    return urls.where(urls.notna() & (urls != ""), headline_keys).astype(str)
+
+
+def story_keys(df):
+    """
+    Near-duplicate story id per row, with rows lacking one as their own story
+
+    Merged news files mix scraper rows that carry a story_id with rows from
+    other scrapers that don't; those must not collapse into a single story.
+    """
+    positional = pd.Series([f"row-{i}" for i in range(len(df))], index=df.index)
+    if "story_id" not in df.columns:
+        return positional
+    return df["story_id"].astype(object).where(df["story_id"].notna(), positional)
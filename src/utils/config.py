@@ -10,6 +10,49 @@ class Config:
     RAW = "data/raw/"
     PROCESSED = "data/processed/"
     LOGS = "data/logs/"
+    PREDICTIONS_STORE = "data/processed/predictions/"
+
+    # ML
+    TRAIN_SHARD_ROWS = 100_000  # rows per shard for out-of-core training
+    PREDICTION_CACHE_FILE = "data/processed/prediction_cache.pkl"
+    PREDICTION_CACHE_SIZE = 200_000  # max cached rows before LRU eviction
+
+    # Sentiment
+    SENTIMENT_CACHE_DB = "data/processed/sentiment_cache.sqlite"
+    SENTIMENT_LABELS_FILE = "data/raw/sentiment/labeled_headlines.csv"
+    SENTIMENT_LINEAR_MODEL = "data/processed/sentiment_linear.npz"
+    SENTIMENT_SERIES_DIR = "data/processed/sentiment_series/"
+    SENTIMENT_SERIES_BUCKETS = ["5m", "1h", "1d"]
+    PIPELINE_QUEUE_SIZE = 16  # batches buffered between streaming stages
+    TOPIC_MODEL_FILE = "data/processed/headline_topics.pkl"
+    TOPIC_CLUSTERS = 20
+
+    # Scraping
+    SCRAPER_TIMEOUT = 15  # seconds per HTTP request
+    SCRAPER_POOL_MAXSIZE = 10  # keep-alive connections per host
+    SCRAPER_RATE_PER_DOMAIN = 1.0  # sustained requests/second per domain
+    SCRAPER_BURST = 2  # requests a domain may receive back-to-back
+    SCRAPER_MAX_IN_FLIGHT = 2  # concurrent requests per domain
+    # Per-domain overrides: {"finviz.com": (rate, burst, max_in_flight)}
+    SCRAPER_DOMAIN_LIMITS = {}
+    SCRAPER_PARSE_WORKERS = 0  # parser processes (0 = parse in fetch threads, None = all cores)
+    BREAKER_FAILURE_THRESHOLD = 3  # consecutive failures/blocks before a source is skipped
+    BREAKER_BASE_COOLDOWN = 30  # seconds; doubles on each re-open
+    BREAKER_MAX_COOLDOWN = 900
+    SEEN_INDEX_DIR = "data/processed/seen_index/"
+    SEEN_INDEX_CAPACITY = 1_000_000  # articles before the Bloom filter is rebuilt larger
+    SEEN_INDEX_ERROR_RATE = 0.001
+    NEWS_STORE_DIR = "data/processed/news_store/"  # symbol=/date= partitions of scraped articles
+    SELENIUM_POOL_SIZE = 3  # long-lived headless Chrome drivers
+    SELENIUM_WAIT_TIMEOUT = 30  # seconds to wait for target elements
+    HTTP_CACHE_DB = "data/processed/http_cache.sqlite"
+    HTTP_CACHE_MAX_MB = 64
+    HTTP_CACHE_TTL = 300  # seconds a page is reused without any request
+    # Per-source TTL overrides, keyed by source name
+    HTTP_CACHE_SOURCE_TTL = {"Finviz": 120, "Seeking Alpha": 600}
+    FUNDAMENTALS_CACHE_DIR = "data/processed/fundamentals_cache/"  # all statements per symbol
+    FUNDAMENTALS_CACHE_TTL = 24 * 3600  # seconds; statements change once a quarter
+    FUNDAMENTALS_FETCH_WORKERS = 16  # concurrent symbol fetches (I/O-bound)
 
     # Stocks
     STOCKS = ["AAPL", "TSLA", "MSFT", "GOOG", "NVDA", "JPM"]
@@ -1,3 +1,5 @@
+import multiprocessing
+
 import pandas as pd
 from src.utils.logger import log
 
@@ -8,3 +10,13 @@ def save_csv(df, path):
 def load_csv(path):
     log(f"Loaded file: {path}")
     return pd.read_csv(path)
+
+def mp_context():
+    """
+    Start method for worker pools: forkserver, or spawn where unavailable
+
+    A plain fork copies locks held by other threads (logging, urllib3,
+    SQLite) into the child, which then deadlocks on them.
+    """
+    method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+    return multiprocessing.get_context(method)
@@ -8,6 +8,8 @@ from datetime import datetime
 # Ensure project root on sys.path for src.* imports
 from streamlit_app import path_setup  # noqa: F401
 from src.utils.config import Config
+from src.sentiment.sentiment_series import SentimentSeries
+from src.sentiment.topic_clusters import HeadlineTopics
 
 st.header("📰 News Sentiment Analysis")
 
@@ -98,10 +100,23 @@ if df is not None and not df.empty:
                         st.error(f"❌ Error running sentiment analysis: {e}")
                         st.info("💡 Try running from terminal: `python run_sentiment_analysis.py`")
     
+    # Pre-aggregated per-symbol sentiment series (maintained by generate_sentiment)
+    stocks_in_view = selected_stocks if selected_stocks else Config.STOCKS
+    daily_series = SentimentSeries("1d").load(symbols=stocks_in_view)
+
     with col2:
         st.subheader("📈 Sentiment by Stock")
-        if "symbol" in df.columns and "sentiment" in df.columns:
+        if not daily_series.empty:
+            sentiment_by_stock = (
+                daily_series.groupby("symbol")[["positive", "negative", "neutral"]].sum()
+                .reset_index()
+                .melt(id_vars="symbol", var_name="sentiment", value_name="count")
+            )
+        elif "symbol" in df.columns and "sentiment" in df.columns:
             sentiment_by_stock = df.groupby(["symbol", "sentiment"]).size().reset_index(name="count")
+        else:
+            sentiment_by_stock = None
+        if sentiment_by_stock is not None:
             fig_bar = px.bar(
                 sentiment_by_stock,
                 x="symbol",
@@ -117,6 +132,28 @@ if df is not None and not df.empty:
             )
             st.plotly_chart(fig_bar, use_container_width=True)
     
+    # Sentiment over time from the materialized series
+    bucket = st.selectbox("Sentiment trend bucket", options=["1h", "5m", "1d"], key="sentiment_bucket")
+    trend_df = SentimentSeries(bucket).load(symbols=stocks_in_view)
+    if not trend_df.empty:
+        st.subheader("⏱️ Sentiment Over Time")
+        fig_trend = px.line(
+            trend_df,
+            x="bucket_start",
+            y="decayed_score",
+            color="symbol",
+            title=f"Exponentially Decayed Sentiment ({bucket} buckets)",
+            hover_data=["count", "mean_score", "rolling_mean_score"]
+        )
+        st.plotly_chart(fig_trend, use_container_width=True)
+
+    # Per-symbol story topics (maintained by python -m src.sentiment.topic_clusters)
+    if os.path.exists(Config.TOPIC_MODEL_FILE):
+        topic_summary = HeadlineTopics.load().symbol_summary(symbols=stocks_in_view)
+        if not topic_summary.empty:
+            st.subheader("🧭 Story Topics by Stock")
+            st.dataframe(topic_summary, use_container_width=True, hide_index=True)
+
     # Source analysis
     if "source" in df.columns:
         st.subheader("📰 News Sources")